@@ -3,15 +3,49 @@ Defines a lightweight parameterized quantum circuit (PQC) for one qubit.
 The circuit applies three rotations RX, RY and RZ. Because the repository
 focuses on pedagogy, all steps are commented and a helper function returns
 the statevector so it can be compared with exact dynamics.
+
+Two interchangeable backends evaluate the circuit:
+    "numpy"     closed-form statevector and derivatives (fast, default)
+    "pennylane" QNode on `default.qubit` differentiated with qml.jacobian
+
+For multi-qubit systems `HardwareEfficientAnsatz` provides a layered circuit
+(per-qubit rotations followed by a CNOT/CZ ladder) with the same
+`ansatz_state` / `derivative_states` methods, simulated directly on a NumPy
+statevector.
+
+PennyLane is only imported (and the device only created) the first time the
+"pennylane" backend or `DEV` is used, so NumPy-only runs never pay for it.
 """
 
 from __future__ import annotations
 
+from typing import Sequence
+
 import numpy as np
-import pennylane as qml
 
-# Single-qubit device used for all demonstrations
-DEV = qml.device("default.qubit", wires=1)
+from .profiling import count, stage
+
+BACKENDS = ("numpy", "pennylane")
+_backend = "numpy"
+
+
+def set_backend(name: str) -> None:
+    """Select the backend used by `ansatz_state` and `derivative_states`.
+
+    Args:
+        name: One of `BACKENDS`.
+    """
+
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown ansatz backend '{name}', expected one of {BACKENDS}")
+    _backend = name
+
+
+def get_backend() -> str:
+    """Return the name of the active ansatz backend."""
+
+    return _backend
 
 
 def prepare_initial_state() -> np.ndarray:
@@ -25,7 +59,95 @@ def prepare_initial_state() -> np.ndarray:
     return np.array([0.05, 0.05, 0.05], dtype=float)
 
 
-@qml.qnode(DEV)
+_device = None
+_qnode = None
+
+
+def get_device():
+    """Return the single-qubit `default.qubit` device, creating it on first use."""
+
+    global _device
+    if _device is None:
+        import pennylane as qml
+
+        _device = qml.device("default.qubit", wires=1)
+    return _device
+
+
+def _pennylane_state(params: np.ndarray) -> np.ndarray:
+    """QNode version of the circuit RZ(rz) RY(ry) RX(rx) |0>."""
+
+    global _qnode
+    if _qnode is None:
+        import pennylane as qml
+
+        def circuit(p):
+            # Indexing the last axis lets PennyLane broadcast over a batch of rows.
+            qml.RX(p[..., 0], wires=0)
+            qml.RY(p[..., 1], wires=0)
+            qml.RZ(p[..., 2], wires=0)
+            return qml.state()
+
+        _qnode = qml.QNode(circuit, get_device())
+    return _qnode(params)
+
+
+def _pennylane_derivatives(params: np.ndarray) -> np.ndarray:
+    """Jacobian of the QNode state with shape (num_params, state_dim)."""
+
+    import pennylane as qml
+    from pennylane import numpy as pnp
+
+    # autograd cannot differentiate complex outputs directly, so we stack the
+    # real and imaginary parts and recombine them after taking the jacobian.
+    def real_imag_state(p):
+        state = _pennylane_state(p)
+        return qml.math.stack([qml.math.real(state), qml.math.imag(state)])
+
+    jac = qml.jacobian(real_imag_state)(pnp.array(params, requires_grad=True))
+    # jac has shape (2, state_dim, num_params); reorder to (num_params, state_dim)
+    return np.array(jac[0] + 1j * jac[1]).T
+
+
+def _rotation_terms(params: np.ndarray) -> tuple:
+    """Return the building blocks of the closed-form statevector.
+
+    Writing ca = cos(rx/2), sa = sin(rx/2) (and likewise for ry), the state
+    before the final RZ is y = RY RX |0> = [cb*ca + i sb*sa, sb*ca - i cb*sa],
+    and RZ multiplies its components by e^{-i rz/2} and e^{+i rz/2}.
+    """
+
+    params = np.asarray(params, dtype=float)
+    half = 0.5 * params
+    ca, cb = np.cos(half[..., 0]), np.cos(half[..., 1])
+    sa, sb = np.sin(half[..., 0]), np.sin(half[..., 1])
+    phase = np.exp(-0.5j * params[..., 2])
+    return ca, sa, cb, sb, phase
+
+
+def _numpy_state(params: np.ndarray) -> np.ndarray:
+    """Closed-form statevector of RZ(rz) RY(ry) RX(rx) |0>."""
+
+    ca, sa, cb, sb, phase = _rotation_terms(params)
+    y0 = cb * ca + 1j * sb * sa
+    y1 = sb * ca - 1j * cb * sa
+    return np.stack([phase * y0, np.conj(phase) * y1], axis=-1)
+
+
+def _numpy_derivatives(params: np.ndarray) -> np.ndarray:
+    """Closed-form d|psi>/dθ_i with shape (num_params, state_dim)."""
+
+    ca, sa, cb, sb, phase = _rotation_terms(params)
+    phases = np.stack([phase, np.conj(phase)], axis=-1)
+    y = np.stack([cb * ca + 1j * sb * sa, sb * ca - 1j * cb * sa], axis=-1)
+    # Each half-angle derivative swaps cos -> -sin/2 and sin -> cos/2.
+    dy_rx = 0.5 * np.stack([-cb * sa + 1j * sb * ca, -sb * sa - 1j * cb * ca], axis=-1)
+    dy_ry = 0.5 * np.stack([-sb * ca + 1j * cb * sa, cb * ca + 1j * sb * sa], axis=-1)
+    # d/drz of diag(e^{-i rz/2}, e^{i rz/2}) is diag(-i/2, i/2) times itself.
+    dy_rz = 0.5j * y * np.array([-1.0, 1.0])
+    return np.stack([phases * dy_rx, phases * dy_ry, phases * dy_rz], axis=-2)
+
+
 def ansatz_state(params: np.ndarray) -> np.ndarray:
     """Return the statevector produced by the parameterized circuit.
 
@@ -36,11 +158,10 @@ def ansatz_state(params: np.ndarray) -> np.ndarray:
         Complex statevector of length 2 (for one qubit).
     """
 
-    rx, ry, rz = params
-    qml.RX(rx, wires=0)
-    qml.RY(ry, wires=0)
-    qml.RZ(rz, wires=0)
-    return qml.state()
+    count(f"ansatz.state_calls[{_backend}]")
+    if _backend == "pennylane":
+        return np.asarray(_pennylane_state(params))
+    return _numpy_state(params)
 
 
 def ansatz_expectations(params: np.ndarray) -> float:
@@ -64,10 +185,263 @@ def derivative_states(params: np.ndarray) -> np.ndarray:
         Array with shape (num_params, state_dim) containing d|psi>/dθ_i.
     """
 
-    # autograd supports jacobian on complex outputs; PennyLane exposes it via qml.jacobian
-    jac_fn = qml.jacobian(ansatz_state, argnum=0)
-    jac = jac_fn(params)
-    return np.array(jac)
+    count(f"ansatz.jacobian_calls[{_backend}]")
+    if _backend == "pennylane":
+        return _pennylane_derivatives(params)
+    return _numpy_derivatives(params)
+
+
+def _as_batch(params_batch: np.ndarray) -> np.ndarray:
+    """Validate a batch of parameter vectors with shape (N, 3)."""
+
+    params_batch = np.asarray(params_batch, dtype=float)
+    if params_batch.ndim != 2 or params_batch.shape[1] != 3:
+        raise ValueError(f"Expected parameter batch of shape (N, 3), got {params_batch.shape}")
+    return params_batch
+
+
+def ansatz_state_batch(params_batch: np.ndarray) -> np.ndarray:
+    """Evaluate the statevector for many parameter vectors at once.
+
+    Args:
+        params_batch: Array with shape (N, 3), one parameter vector per row.
+
+    Returns:
+        Complex array with shape (N, 2).
+    """
+
+    params_batch = _as_batch(params_batch)
+    with stage("ansatz.state_batch"):
+        if _backend == "pennylane":
+            return np.asarray(_pennylane_state(params_batch)).reshape(-1, 2)
+        return _numpy_state(params_batch)
+
+
+def derivative_states_batch(params_batch: np.ndarray) -> np.ndarray:
+    """Evaluate d|psi>/dθ_i for many parameter vectors at once.
+
+    Args:
+        params_batch: Array with shape (N, 3), one parameter vector per row.
+
+    Returns:
+        Complex array with shape (N, 3, 2).
+    """
+
+    params_batch = _as_batch(params_batch)
+    with stage("ansatz.jacobian_batch"):
+        if _backend == "pennylane":
+            # qml.jacobian does not broadcast, so fall back to one call per row.
+            return np.array([_pennylane_derivatives(row) for row in params_batch]).reshape(-1, 3, 2)
+        return _numpy_derivatives(params_batch)
+
+
+_ROTATION_GENERATORS = {
+    "RX": np.array([[0.0, 1.0], [1.0, 0.0]], dtype=complex),
+    "RY": np.array([[0.0, -1.0j], [1.0j, 0.0]], dtype=complex),
+    "RZ": np.array([[1.0, 0.0], [0.0, -1.0]], dtype=complex),
+}
+
+_ENTANGLERS = {
+    "CNOT": np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex),
+    "CZ": np.diag([1.0, 1.0, 1.0, -1.0]).astype(complex),
+}
+
+
+def _rotation_matrix(name: str, theta: float) -> np.ndarray:
+    """Return exp(-i θ P / 2) for the Pauli generator of `name`."""
+
+    return np.cos(0.5 * theta) * np.eye(2) - 1j * np.sin(0.5 * theta) * _ROTATION_GENERATORS[name]
+
+
+def _apply_one_qubit(states: np.ndarray, gate: np.ndarray, wire: int) -> np.ndarray:
+    """Apply a 2x2 gate to `wire` of a batch of states shaped (B, 2, ..., 2)."""
+
+    axis = wire + 1
+    return np.moveaxis(np.tensordot(gate, states, axes=([1], [axis])), 0, axis)
+
+
+def _apply_two_qubit(states: np.ndarray, gate: np.ndarray, wires: tuple) -> np.ndarray:
+    """Apply a 4x4 gate to `wires` of a batch of states shaped (B, 2, ..., 2)."""
+
+    axes = [wires[0] + 1, wires[1] + 1]
+    out = np.tensordot(gate.reshape(2, 2, 2, 2), states, axes=([2, 3], axes))
+    return np.moveaxis(out, [0, 1], axes)
+
+
+class HardwareEfficientAnsatz:
+    """Layered hardware-efficient ansatz on n qubits.
+
+    Each layer applies every rotation in `rotations` to every qubit (one
+    parameter each) and then an entangling ladder on wires (0, 1), (1, 2),
+    ... The circuit starts from |0...0>.
+
+    Derivatives use an analytic forward sweep: whenever a rotation
+    exp(-i θ P / 2) is applied, its derivative -i/2 P |phi> joins a batch of
+    tangent vectors, and every later gate acts on the whole batch in one
+    vectorized call. Each gate is therefore applied once per sweep instead of
+    once per parameter.
+
+    When only overlaps <b|dpsi_i> are needed (e.g. the C vector with
+    b = H|psi>), `adjoint_jacobian` uses the adjoint method instead: a single
+    backward sweep with two statevectors and O(P) gate applications.
+
+    Args:
+        n_qubits: Number of qubits.
+        n_layers: Number of rotation + entangler layers.
+        rotations: Rotation gates per qubit and layer, from "RX", "RY", "RZ".
+        entangler: Two-qubit gate of the ladder, "CNOT" or "CZ".
+    """
+
+    def __init__(
+        self,
+        n_qubits: int,
+        n_layers: int,
+        rotations: Sequence[str] = ("RY", "RZ"),
+        entangler: str = "CNOT",
+    ):
+        if entangler not in _ENTANGLERS:
+            raise ValueError(f"Unknown entangler '{entangler}', expected one of {tuple(_ENTANGLERS)}")
+        for rotation in rotations:
+            if rotation not in _ROTATION_GENERATORS:
+                raise ValueError(
+                    f"Unknown rotation '{rotation}', expected one of {tuple(_ROTATION_GENERATORS)}"
+                )
+        self.n_qubits = n_qubits
+        self.n_layers = n_layers
+        self.rotations = tuple(rotations)
+        self.entangler = entangler
+        self.num_params = n_layers * n_qubits * len(self.rotations)
+        self.dim = 2**n_qubits
+
+    def operations(self) -> list:
+        """Return the gate sequence as (name, wires, param_index) tuples.
+
+        `param_index` is None for the fixed entangling gates.
+        """
+
+        ops = []
+        index = 0
+        for _ in range(self.n_layers):
+            for wire in range(self.n_qubits):
+                for rotation in self.rotations:
+                    ops.append((rotation, (wire,), index))
+                    index += 1
+            for wire in range(self.n_qubits - 1):
+                ops.append((self.entangler, (wire, wire + 1), None))
+        return ops
+
+    def prepare_initial_state(self) -> np.ndarray:
+        """Small rotation angles near |0...0>, mirroring `prepare_initial_state`."""
+
+        return np.full(self.num_params, 0.05)
+
+    def circuit(self, params: np.ndarray) -> None:
+        """Queue the circuit as PennyLane operations (use inside a QNode)."""
+
+        import pennylane as qml
+
+        pl_gates = {"RX": qml.RX, "RY": qml.RY, "RZ": qml.RZ, "CNOT": qml.CNOT, "CZ": qml.CZ}
+        for name, wires, index in self.operations():
+            if index is None:
+                pl_gates[name](wires=list(wires))
+            else:
+                pl_gates[name](params[index], wires=wires[0])
+
+    def _check_params(self, params: np.ndarray) -> np.ndarray:
+        params = np.asarray(params, dtype=float)
+        if params.shape != (self.num_params,):
+            raise ValueError(f"Expected {self.num_params} parameters, got shape {params.shape}")
+        return params
+
+    def _zero_state(self, batch: int) -> np.ndarray:
+        states = np.zeros((batch,) + (2,) * self.n_qubits, dtype=complex)
+        states[(0,) * (self.n_qubits + 1)] = 1.0
+        return states
+
+    def ansatz_state(self, params: np.ndarray) -> np.ndarray:
+        """Return the statevector with shape (2**n_qubits,)."""
+
+        params = self._check_params(params)
+        state = self._zero_state(1)
+        for name, wires, index in self.operations():
+            if index is None:
+                state = _apply_two_qubit(state, _ENTANGLERS[name], wires)
+            else:
+                state = _apply_one_qubit(state, _rotation_matrix(name, params[index]), wires[0])
+        return state.reshape(self.dim)
+
+    def derivative_states(self, params: np.ndarray) -> np.ndarray:
+        """Return d|psi>/dθ_i with shape (num_params, 2**n_qubits)."""
+
+        params = self._check_params(params)
+        # Row 0 is |psi>; row k + 1 holds the tangent vector of parameter k.
+        stack = self._zero_state(self.num_params + 1)
+        active = 1
+        for name, wires, index in self.operations():
+            if index is None:
+                stack[:active] = _apply_two_qubit(stack[:active], _ENTANGLERS[name], wires)
+                continue
+            stack[:active] = _apply_one_qubit(stack[:active], _rotation_matrix(name, params[index]), wires[0])
+            # d/dθ exp(-i θ P / 2) = -i/2 P exp(-i θ P / 2)
+            generator = -0.5j * _ROTATION_GENERATORS[name]
+            stack[active] = _apply_one_qubit(stack[:1], generator, wires[0])[0]
+            active += 1
+        return stack[1:].reshape(self.num_params, self.dim)
+
+    def adjoint_jacobian(self, params: np.ndarray, bra: np.ndarray) -> np.ndarray:
+        """Return <bra|dpsi_i> for every parameter with one backward sweep.
+
+        Starting from |phi> = |psi> and |lam> = |bra>, the gates are undone one
+        by one. At rotation i, |phi> is the state right after that gate and
+        |lam> is the bra pulled back through all later gates, so
+        <bra|dpsi_i> = <lam| (-i/2 P_i) |phi>.
+
+        Args:
+            params: Parameter vector.
+            bra: Vector with shape (2**n_qubits,).
+
+        Returns:
+            Complex array with shape (num_params,).
+        """
+
+        count("ansatz.adjoint_jacobian_calls")
+        params = self._check_params(params)
+        shape = (1,) + (2,) * self.n_qubits
+        phi = self.ansatz_state(params).reshape(shape)
+        lam = np.asarray(bra, dtype=complex).reshape(shape)
+        overlaps = np.zeros(self.num_params, dtype=complex)
+        for name, wires, index in reversed(self.operations()):
+            if index is None:
+                # CNOT and CZ are their own inverses
+                phi = _apply_two_qubit(phi, _ENTANGLERS[name], wires)
+                lam = _apply_two_qubit(lam, _ENTANGLERS[name], wires)
+                continue
+            generated = _apply_one_qubit(phi, -0.5j * _ROTATION_GENERATORS[name], wires[0])
+            overlaps[index] = np.vdot(lam, generated)
+            inverse = _rotation_matrix(name, -params[index])
+            phi = _apply_one_qubit(phi, inverse, wires[0])
+            lam = _apply_one_qubit(lam, inverse, wires[0])
+        return overlaps
+
+
+def __getattr__(name: str):
+    # `DEV` used to be created at import time; keep it reachable lazily as
+    # `ansatz.DEV` but out of `__all__`, so star imports stay PennyLane-free.
+    if name == "DEV":
+        return get_device()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ["ansatz_state", "ansatz_expectations", "derivative_states", "prepare_initial_state", "DEV"]
+__all__ = [
+    "HardwareEfficientAnsatz",
+    "ansatz_state",
+    "ansatz_state_batch",
+    "ansatz_expectations",
+    "derivative_states",
+    "derivative_states_batch",
+    "prepare_initial_state",
+    "set_backend",
+    "get_backend",
+    "BACKENDS",
+    "get_device",
+]
@@ -0,0 +1,198 @@
+"""bench.py
+Throughput benchmarks for the variational and exact engines.
+
+Run `python -m app.bench --output results.json` to time
+    derivative_states     Jacobian evaluations per second
+    vqs_update            McLachlan steps per second
+    run_exact_sim         exact propagation steps per second per engine
+    run_full_simulation   end-to-end steps per second
+across qubit counts, layer counts (i.e. parameter counts) and time steps.
+Every case also records the peak Python memory of one call (tracemalloc).
+The JSON output can be compared across commits with
+`benchmarks/compare.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from typing import Callable, Sequence
+
+import numpy as np
+import scipy
+
+from . import ansatz as single_qubit_ansatz
+from .ansatz import HardwareEfficientAnsatz
+from .hamiltonian import heisenberg_chain, ising_chain
+from .simulator_exact import ENGINES, run_exact_sim
+from .trainer import run_full_simulation
+from .vqs_core import vqs_update
+
+
+def measure(fn: Callable, min_time: float = 0.2, max_calls: int = 10_000) -> dict:
+    """Time repeated calls of `fn` and the peak memory of one call.
+
+    Returns:
+        Dict with calls, seconds, calls_per_second and peak_memory_bytes.
+    """
+
+    fn()  # warm-up: imports, caches, device construction
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while calls == 0 or (elapsed < min_time and calls < max_calls):
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "calls": calls,
+        "seconds": elapsed,
+        "calls_per_second": calls / elapsed,
+        "peak_memory_bytes": peak,
+    }
+
+
+def _ansatz_cases(qubits: Sequence[int], layers: Sequence[int]) -> list:
+    """(label, backend, ansatz, hamiltonian, params) for every configuration.
+
+    The backend is set for the single-qubit module ansatz and None for the
+    hardware-efficient cases, which do not use it.
+    """
+
+    cases = []
+    params = single_qubit_ansatz.prepare_initial_state()
+    for backend in single_qubit_ansatz.BACKENDS:
+        cases.append((f"rx_ry_rz[{backend}]", backend, None, None, params))
+    for n_qubits in qubits:
+        for n_layers in layers:
+            hea = HardwareEfficientAnsatz(n_qubits, n_layers)
+            label = f"hea[q={n_qubits},l={n_layers}]"
+            cases.append((label, None, hea, ising_chain(n_qubits), hea.prepare_initial_state()))
+    return cases
+
+
+def bench_ansatz(qubits: Sequence[int], layers: Sequence[int], dt: float, min_time: float) -> list:
+    """Benchmark derivative_states and vqs_update for every ansatz case."""
+
+    results = []
+    previous_backend = single_qubit_ansatz.get_backend()
+    try:
+        for label, backend, ansatz, hamiltonian, params in _ansatz_cases(qubits, layers):
+            if backend is not None:
+                single_qubit_ansatz.set_backend(backend)
+            source = ansatz or single_qubit_ansatz
+            state_dim = len(source.ansatz_state(params))
+            common = {"ansatz": label, "num_params": len(params), "state_dim": state_dim}
+            jac = measure(lambda: source.derivative_states(params), min_time)
+            results.append({"case": "derivative_states", **common, **jac})
+            step = measure(lambda: vqs_update(params, 0.0, dt, ansatz, hamiltonian), min_time)
+            results.append({"case": "vqs_update", "dt": dt, **common, **step})
+    finally:
+        single_qubit_ansatz.set_backend(previous_backend)
+    return results
+
+
+def bench_exact(qubits: Sequence[int], dts: Sequence[float], t_span: float, min_time: float) -> list:
+    """Benchmark run_exact_sim engines on the qubit and on Heisenberg chains."""
+
+    results = []
+    psi0 = np.array([1.0, 0.0], dtype=complex)
+    for dt in dts:
+        num_steps = int(t_span / dt)
+        for engine in ENGINES:
+            timing = measure(lambda: run_exact_sim(psi0, t_span, dt, engine=engine), min_time, max_calls=100)
+            timing["steps_per_second"] = num_steps * timing["calls_per_second"]
+            results.append({"case": "run_exact_sim", "engine": engine, "qubits": 1, "dt": dt, **timing})
+        for n_qubits in qubits:
+            if n_qubits < 2:
+                continue
+            model = heisenberg_chain(n_qubits)
+            chain_psi0 = np.zeros(model.dim, dtype=complex)
+            chain_psi0[0] = 1.0
+            timing = measure(
+                lambda: run_exact_sim(chain_psi0, t_span, dt, engine="krylov", hamiltonian=model),
+                min_time,
+                max_calls=20,
+            )
+            timing["steps_per_second"] = num_steps * timing["calls_per_second"]
+            common = {"case": "run_exact_sim", "engine": "krylov", "qubits": n_qubits, "dt": dt}
+            results.append({**common, **timing})
+    return results
+
+
+def bench_full_simulation(dts: Sequence[float], t_span: float, min_time: float) -> list:
+    """Benchmark the end-to-end single-qubit pipeline."""
+
+    results = []
+    for dt in dts:
+        timing = measure(lambda: run_full_simulation(t_span=t_span, dt=dt), min_time, max_calls=50)
+        timing["steps_per_second"] = int(t_span / dt) * timing["calls_per_second"]
+        results.append({"case": "run_full_simulation", "dt": dt, "t_span": t_span, **timing})
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmarks(
+    qubits: Sequence[int] = (2, 4),
+    layers: Sequence[int] = (1, 3),
+    dts: Sequence[float] = (0.05, 0.01),
+    t_span: float = 1.0,
+    min_time: float = 0.2,
+) -> dict:
+    """Run every benchmark group and return a JSON-serializable report."""
+
+    results = bench_ansatz(qubits, layers, dts[0], min_time)
+    results += bench_exact(qubits, dts, t_span, min_time)
+    results += bench_full_simulation(dts, t_span, min_time)
+    return {
+        "revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """CLI argument parser."""
+
+    parser = argparse.ArgumentParser(description="Benchmark the VQS and exact engines")
+    parser.add_argument("--qubits", type=int, nargs="+", default=[2, 4], help="Qubit counts for chain models")
+    parser.add_argument("--layers", type=int, nargs="+", default=[1, 3], help="Ansatz layer counts")
+    parser.add_argument("--dt", type=float, nargs="+", default=[0.05, 0.01], help="Time steps")
+    parser.add_argument("--tmax", type=float, default=1.0, help="Final time for trajectory benchmarks")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds spent timing each case")
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmarks(args.qubits, args.layers, args.dt, args.tmax, args.min_time)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
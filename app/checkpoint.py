@@ -0,0 +1,156 @@
+"""checkpoint.py
+Compact on-disk checkpoints for long variational runs.
+
+A checkpoint is a small `.npz` archive holding the run settings (time grid,
+integrator, tolerances, real/imaginary mode, energy tolerance and the frozen
+Hamiltonian time of imaginary runs) and the loop state (next step index,
+current parameters, accepted step times, condition numbers, energies, the
+number of theta_dot evaluations, the adaptive integrator's next trial step,
+the convergence flag and how many history rows are committed).
+Finite-shot runs additionally store the state of the estimator's random
+generator (as JSON).
+
+The per-step histories (parameters, states and, for finite-shot runs, the
+theta_dot standard errors) live in `.npy` files next to the archive, e.g.
+"run.param_history.npy" for "run.npz". Each save writes only the rows
+filled since the previous one, so checkpointing a run of N steps costs
+O(N) I/O in total. The archive is written to a temporary name and renamed;
+it is the commit point, and history rows beyond its committed counts are
+ignored on load, so a process killed mid-write never leaves a broken
+checkpoint behind.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+import numpy as np
+
+_SETTINGS = ("t_span", "dt", "integrator", "rtol", "atol", "mode", "energy_tol", "hamiltonian_time")
+_HISTORIES = ("param_history", "state_history", "theta_dot_std")
+
+
+def _none_as_nan(value):
+    return np.nan if value is None else value
+
+
+def _nan_as_none(value):
+    return None if isinstance(value, float) and np.isnan(value) else value
+
+
+def history_path(path: str, key: str) -> str:
+    """Return the `.npy` file that holds history `key` of checkpoint `path`."""
+
+    return f"{os.path.splitext(path)[0]}.{key}.npy"
+
+
+def _filled_rows(progress: dict, key: str) -> int:
+    """Number of leading rows of history `key` the loop has written."""
+
+    # State row k - 1 and theta_dot_std row k - 1 are written at the start of
+    # step k, parameter row k at its end; a converged run stops after the
+    # state row of its last grid point.
+    if key == "param_history" or (key == "state_history" and progress["converged"]):
+        return progress["next_step"]
+    return progress["next_step"] - 1
+
+
+def _append_rows(path: str, array, start: int, stop: int) -> None:
+    """Write rows [start, stop) of `array` into the history file `path`."""
+
+    if start == 0 or not os.path.exists(path):
+        target = np.lib.format.open_memmap(path, mode="w+", dtype=array.dtype, shape=array.shape)
+        start = 0
+    else:
+        target = np.lib.format.open_memmap(path, mode="r+")
+    target[start:stop] = array[start:stop]
+    target.flush()
+    del target
+
+
+def save_checkpoint(path: str, progress: dict, settings: dict) -> None:
+    """Write the loop state and the new history rows of a run.
+
+    Args:
+        path: Destination file (conventionally ending in ".npz").
+        progress: Loop state with keys next_step, params, param_history,
+            state_history, step_times, condition_numbers, energies,
+            rhs_evaluations, trial_step (None before the first adaptive
+            step) and converged; optionally theta_dot_std and rng_state for
+            finite-shot runs. Its "saved_rows" entry records how many rows
+            of every history are already on disk and is updated here.
+        settings: Run settings with keys t_span, dt, integrator, rtol, atol,
+            mode, energy_tol (None when disabled) and hamiltonian_time.
+    """
+
+    saved_rows = progress.setdefault("saved_rows", {})
+    rows = {}
+    for key in _HISTORIES:
+        if progress.get(key) is None:
+            continue
+        rows[key] = _filled_rows(progress, key)
+        _append_rows(history_path(path, key), progress[key], saved_rows.get(key, 0), rows[key])
+    trial_step = progress["trial_step"]
+    extras = {}
+    if progress.get("rng_state") is not None:
+        extras["rng_state"] = json.dumps(progress["rng_state"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        np.savez(
+            handle,
+            next_step=progress["next_step"],
+            params=progress["params"],
+            step_times=np.asarray(progress["step_times"], dtype=float),
+            condition_numbers=progress["condition_numbers"],
+            energies=progress["energies"],
+            rhs_evaluations=progress["rhs_evaluations"],
+            trial_step=np.nan if trial_step is None else trial_step,
+            converged=progress["converged"],
+            **{f"length_{key}": len(progress[key]) for key in rows},
+            **{f"rows_{key}": value for key, value in rows.items()},
+            **{f"setting_{key}": _none_as_nan(settings[key]) for key in _SETTINGS},
+            **extras,
+        )
+    os.replace(tmp_path, path)
+    saved_rows.update(rows)
+
+
+def load_checkpoint(path: str) -> tuple:
+    """Read a checkpoint written by `save_checkpoint`.
+
+    Returns:
+        Tuple (progress, settings) with the same keys that were saved. The
+        histories are read into memory with their uncommitted rows zeroed.
+    """
+
+    with np.load(path) as data:
+        trial_step = float(data["trial_step"])
+        progress = {
+            "next_step": int(data["next_step"]),
+            "params": data["params"].copy(),
+            "step_times": list(data["step_times"]),
+            "condition_numbers": data["condition_numbers"].copy(),
+            "energies": data["energies"].copy(),
+            "rhs_evaluations": int(data["rhs_evaluations"]),
+            "trial_step": None if np.isnan(trial_step) else trial_step,
+            "converged": bool(data["converged"]),
+        }
+        progress["saved_rows"] = {}
+        for key in _HISTORIES:
+            if f"rows_{key}" not in data:
+                continue
+            rows, length = int(data[f"rows_{key}"]), int(data[f"length_{key}"])
+            stored = np.load(history_path(path, key), mmap_mode="r")
+            history = np.zeros((length,) + stored.shape[1:], dtype=stored.dtype)
+            history[:rows] = stored[:rows]
+            progress[key] = history
+            progress["saved_rows"][key] = rows
+            del stored
+        if "rng_state" in data:
+            progress["rng_state"] = json.loads(data["rng_state"].item())
+        settings = {key: _nan_as_none(data[f"setting_{key}"].item()) for key in _SETTINGS}
+    return progress, settings
+
+
+__all__ = ["save_checkpoint", "load_checkpoint", "history_path"]
@@ -5,12 +5,33 @@ The Hamiltonian used throughout the examples is
 with smooth coefficients a(t) = cos(t), b(t) = sin(t).
 The helper functions return both a PennyLane Hamiltonian object and a
 matrix representation for exact simulations.
+
+Larger models (Ising or Heisenberg chains) are described with
+`TimeDependentPauliHamiltonian`, a sum of n-qubit Pauli strings with
+time-dependent coefficients whose term matrices are built only once.
+The single-qubit helpers above are thin wrappers around such an object.
 """
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from functools import reduce
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Tuple, Union
+
 import numpy as np
-import pennylane as qml
+from scipy import sparse
+
+if TYPE_CHECKING:
+    import pennylane as qml
+
+Coefficient = Union[float, Callable]
+
+_PAULI_MATRICES = {
+    "I": np.array([[1.0, 0.0], [0.0, 1.0]], dtype=complex),
+    "X": np.array([[0.0, 1.0], [1.0, 0.0]], dtype=complex),
+    "Y": np.array([[0.0, -1.0j], [1.0j, 0.0]], dtype=complex),
+    "Z": np.array([[1.0, 0.0], [0.0, -1.0]], dtype=complex),
+}
 
 
 def a_coeff(t: float) -> float:
@@ -39,6 +60,260 @@ def b_coeff(t: float) -> float:
     return float(np.sin(t))
 
 
+def pauli_string_matrix(pauli_string: str) -> sparse.csr_matrix:
+    """Return the sparse matrix of a Pauli string such as "XZI".
+
+    Character k acts on wire k, with wire 0 as the most significant qubit
+    (the same ordering PennyLane uses for `qml.state()`).
+    """
+
+    factors = [sparse.csr_matrix(_PAULI_MATRICES[p]) for p in pauli_string]
+    return reduce(lambda left, right: sparse.kron(left, right, format="csr"), factors)
+
+
+def _nbytes(matrix) -> int:
+    """Memory held by a dense or sparse matrix."""
+
+    if sparse.issparse(matrix):
+        return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    return matrix.nbytes
+
+
+def _as_coefficient_fn(coefficient: Coefficient) -> Callable:
+    """Wrap constants so every coefficient is a vectorizable function of t."""
+
+    if callable(coefficient):
+        return coefficient
+    value = float(coefficient)
+    return lambda t: np.full(np.shape(t), value)
+
+
+class TimeDependentPauliHamiltonian:
+    """Sum of Pauli strings with time-dependent coefficients.
+
+        H(t) = sum_k c_k(t) P_k
+
+    Each coefficient function must accept either a float or an array of
+    times (NumPy ufuncs such as np.cos do this for free). The sparse term
+    matrices P_k are computed once in the constructor, so evaluating H(t)
+    only rescales and sums them.
+
+    Matrices for scalar t are kept in a small LRU cache, so repeated
+    evaluations at the same time within one step (the step context and the
+    RK stages that share its time) are free. The cache is bounded both in
+    entries and in bytes; callers that visit every time once, such as the
+    exact steppers, pass `cache=False`. Cached dense matrices are returned
+    read-only; callers must not modify cached sparse matrices.
+
+    Args:
+        terms: Sequence of (coefficient, pauli_string) pairs. A coefficient is
+            either a constant or a function of t. All strings must have the
+            same length, which sets the number of qubits.
+        cache_size: Number of (kind, t) matrices to keep; 0 disables caching.
+        cache_bytes: Upper bound on the memory held by cached matrices;
+            larger matrices are never cached.
+    """
+
+    def __init__(
+        self,
+        terms: Sequence[Tuple[Coefficient, str]],
+        cache_size: int = 8,
+        cache_bytes: int = 32 * 2**20,
+    ):
+        if not terms:
+            raise ValueError("A Hamiltonian needs at least one Pauli term")
+        strings = [pauli.upper() for _, pauli in terms]
+        n_qubits = len(strings[0])
+        for pauli in strings:
+            if len(pauli) != n_qubits or set(pauli) - set(_PAULI_MATRICES):
+                raise ValueError(f"Invalid Pauli string '{pauli}' for {n_qubits} qubits")
+        self.n_qubits = n_qubits
+        self.dim = 2**n_qubits
+        self.pauli_strings = strings
+        self.coefficient_fns = [_as_coefficient_fn(coefficient) for coefficient, _ in terms]
+        self.term_matrices = [pauli_string_matrix(pauli) for pauli in strings]
+        self._dense_terms = None
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        self._cache_nbytes = 0
+
+    def _cached(self, kind: str, t: float, build: Callable, cache: bool = True):
+        """Return build(t) through the LRU cache keyed on (kind, t)."""
+
+        if not cache or self.cache_size <= 0:
+            return build(t)
+        key = (kind, float(t))
+        if key in self._cache:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        self.cache_misses += 1
+        value = build(t)
+        nbytes = _nbytes(value)
+        if nbytes > self.cache_bytes:
+            return value
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        self._cache[key] = value
+        self._cache_nbytes += nbytes
+        while len(self._cache) > self.cache_size or self._cache_nbytes > self.cache_bytes:
+            self._cache_nbytes -= _nbytes(self._cache.popitem(last=False)[1])
+        return value
+
+    def clear_cache(self) -> None:
+        """Drop all cached matrices."""
+
+        self._cache.clear()
+        self._cache_nbytes = 0
+
+    def coefficients(self, t) -> np.ndarray:
+        """Evaluate all coefficients.
+
+        Args:
+            t: Time value or array of times.
+
+        Returns:
+            Array with shape (num_terms,) for scalar t, or
+            (num_terms,) + t.shape for an array of times.
+        """
+
+        shape = np.shape(t)
+        if not shape:
+            return np.array([fn(t) for fn in self.coefficient_fns], dtype=float)
+        return np.array([np.broadcast_to(fn(t), shape) for fn in self.coefficient_fns], dtype=float)
+
+    def sparse_matrix(self, t: float, cache: bool = True) -> sparse.csr_matrix:
+        """Return H(t) as a sparse CSR matrix; `cache=False` bypasses the cache."""
+
+        return self._cached("sparse", t, self._build_sparse, cache)
+
+    def _build_sparse(self, t: float) -> sparse.csr_matrix:
+        coeffs = self.coefficients(t)
+        total = coeffs[0] * self.term_matrices[0]
+        for c, term in zip(coeffs[1:], self.term_matrices[1:]):
+            total = total + c * term
+        return total.tocsr()
+
+    def matrix(self, t, cache: bool = True) -> np.ndarray:
+        """Return H(t) as a dense matrix.
+
+        Args:
+            t: Time value, or an array of times to get a stacked
+                (T, dim, dim) result in one vectorized call.
+            cache: Whether a scalar-t result may go through the cache.
+        """
+
+        if np.ndim(t) == 0:
+            return self._cached("dense", t, self._build_dense, cache)
+        return self._build_dense(t)
+
+    def _build_dense(self, t) -> np.ndarray:
+        if self._dense_terms is None:
+            self._dense_terms = np.array([term.toarray() for term in self.term_matrices])
+        coeffs = self.coefficients(t)
+        # (..., K) @ (K, dim * dim) is a single BLAS call for any shape of t
+        flat = np.moveaxis(coeffs, 0, -1) @ self._dense_terms.reshape(len(self.term_matrices), -1)
+        return flat.reshape(np.shape(t) + (self.dim, self.dim))
+
+    def pennylane(self, t: float) -> qml.Hamiltonian:
+        """Return H(t) as a PennyLane Hamiltonian."""
+
+        import pennylane as qml
+
+        ops = [qml.pauli.string_to_pauli_word(pauli) for pauli in self.pauli_strings]
+        return qml.Hamiltonian(list(self.coefficients(t)), ops)
+
+    def __call__(self, t: float) -> sparse.csr_matrix:
+        return self.sparse_matrix(t)
+
+
+def _chain_bonds(n_qubits: int, periodic: bool) -> list:
+    last = n_qubits if periodic and n_qubits > 2 else n_qubits - 1
+    return [(i, (i + 1) % n_qubits) for i in range(last)]
+
+
+def _two_site_string(n_qubits: int, sites: tuple, pauli: str) -> str:
+    chars = ["I"] * n_qubits
+    for site in sites:
+        chars[site] = pauli
+    return "".join(chars)
+
+
+def default_hamiltonian(z_amplitude: float = 1.0, x_amplitude: float = 1.0) -> TimeDependentPauliHamiltonian:
+    """Single-qubit model z_amplitude * cos(t) Z + x_amplitude * sin(t) X."""
+
+    return TimeDependentPauliHamiltonian(
+        [
+            (lambda t: z_amplitude * np.cos(t), "Z"),
+            (lambda t: x_amplitude * np.sin(t), "X"),
+        ]
+    )
+
+
+def ising_chain(
+    n_qubits: int, coupling: Coefficient = 1.0, field: Coefficient = 1.0, periodic: bool = False
+) -> TimeDependentPauliHamiltonian:
+    """Transverse-field Ising chain -J sum Z_i Z_{i+1} - h sum X_i.
+
+    Args:
+        n_qubits: Chain length.
+        coupling: ZZ coupling J (constant or function of t).
+        field: Transverse field h (constant or function of t).
+        periodic: Whether to close the chain into a ring.
+    """
+
+    coupling_fn = _as_coefficient_fn(coupling)
+    field_fn = _as_coefficient_fn(field)
+    terms = [
+        (lambda t: -coupling_fn(t), _two_site_string(n_qubits, bond, "Z"))
+        for bond in _chain_bonds(n_qubits, periodic)
+    ]
+    terms += [(lambda t: -field_fn(t), _two_site_string(n_qubits, (i,), "X")) for i in range(n_qubits)]
+    return TimeDependentPauliHamiltonian(terms)
+
+
+def heisenberg_chain(
+    n_qubits: int, coupling: Coefficient = 1.0, field: Coefficient = 0.0, periodic: bool = False
+) -> TimeDependentPauliHamiltonian:
+    """Heisenberg chain J sum (XX + YY + ZZ) + h sum Z_i.
+
+    Args:
+        n_qubits: Chain length.
+        coupling: Exchange coupling J (constant or function of t).
+        field: Longitudinal field h (constant or function of t).
+        periodic: Whether to close the chain into a ring.
+    """
+
+    terms = [
+        (coupling, _two_site_string(n_qubits, bond, pauli))
+        for bond in _chain_bonds(n_qubits, periodic)
+        for pauli in "XYZ"
+    ]
+    terms += [(field, _two_site_string(n_qubits, (i,), "Z")) for i in range(n_qubits)]
+    return TimeDependentPauliHamiltonian(terms)
+
+
+# Model used by the single-qubit helpers below
+DEFAULT_HAMILTONIAN = default_hamiltonian()
+
+
+def coefficient_arrays(times: np.ndarray) -> tuple:
+    """Vectorized version of `a_coeff` and `b_coeff` over a time grid.
+
+    Args:
+        times: Array of time values.
+
+    Returns:
+        Tuple (a, b) of arrays with the same shape as `times`.
+    """
+
+    a, b = DEFAULT_HAMILTONIAN.coefficients(np.asarray(times, dtype=float))
+    return a, b
+
+
 def H_of_t(t: float) -> qml.Hamiltonian:
     """Construct the time-dependent PennyLane Hamiltonian H(t).
 
@@ -49,9 +324,7 @@ def H_of_t(t: float) -> qml.Hamiltonian:
         qml.Hamiltonian combining PauliZ and PauliX with smooth coefficients.
     """
 
-    coeffs = [a_coeff(t), b_coeff(t)]
-    ops = [qml.PauliZ(0), qml.PauliX(0)]
-    return qml.Hamiltonian(coeffs, ops)
+    return DEFAULT_HAMILTONIAN.pennylane(t)
 
 
 def hamiltonian_matrix(t: float) -> np.ndarray:
@@ -64,11 +337,35 @@ def hamiltonian_matrix(t: float) -> np.ndarray:
         Complex-valued matrix suitable for exact simulation.
     """
 
-    a_t = a_coeff(t)
-    b_t = b_coeff(t)
-    z_mat = np.array([[1.0, 0.0], [0.0, -1.0]])
-    x_mat = np.array([[0.0, 1.0], [1.0, 0.0]])
-    return a_t * z_mat + b_t * x_mat
+    return DEFAULT_HAMILTONIAN.matrix(t)
+
+
+def hamiltonian_sparse(t: float) -> sparse.csr_matrix:
+    """Return H(t) as a sparse CSR matrix for action-on-vector solvers.
+
+    Args:
+        t: Time value.
+
+    Returns:
+        Complex sparse matrix with the same entries as `hamiltonian_matrix`.
+    """
+
+    return DEFAULT_HAMILTONIAN.sparse_matrix(t)
+
+
+def as_pauli_hamiltonian(hamiltonian: Optional[Callable] = None) -> TimeDependentPauliHamiltonian:
+    """Resolve a Hamiltonian argument to its Pauli-term description.
+
+    None and the single-qubit helpers map to `DEFAULT_HAMILTONIAN`; other
+    callables must already be `TimeDependentPauliHamiltonian`-like objects
+    exposing `term_matrices` and `coefficients(t)`.
+    """
+
+    if hamiltonian is None or hamiltonian in (hamiltonian_matrix, hamiltonian_sparse):
+        return DEFAULT_HAMILTONIAN
+    if not hasattr(hamiltonian, "term_matrices"):
+        raise ValueError("Expected a TimeDependentPauliHamiltonian with Pauli terms")
+    return hamiltonian
 
 
 def initial_state() -> np.ndarray:
@@ -81,4 +378,19 @@ def initial_state() -> np.ndarray:
     return np.array([1.0 + 0.0j, 0.0 + 0.0j])
 
 
-__all__ = ["H_of_t", "hamiltonian_matrix", "initial_state", "a_coeff", "b_coeff"]
+__all__ = [
+    "H_of_t",
+    "hamiltonian_matrix",
+    "hamiltonian_sparse",
+    "initial_state",
+    "a_coeff",
+    "b_coeff",
+    "coefficient_arrays",
+    "pauli_string_matrix",
+    "as_pauli_hamiltonian",
+    "TimeDependentPauliHamiltonian",
+    "default_hamiltonian",
+    "ising_chain",
+    "heisenberg_chain",
+    "DEFAULT_HAMILTONIAN",
+]
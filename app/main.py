@@ -2,44 +2,125 @@
 Command-line entry point for running the variational quantum simulator.
 The script performs both variational and exact simulations, saves SVG figures
 and prints simple summary metrics so beginners can follow what happened.
+
+The `sweep` subcommand runs a grid of configurations on a process pool and
+prints one JSON summary per configuration as soon as it finishes.
+
+Heavy dependencies are loaded on demand: matplotlib on the first plot (skipped
+entirely with --no-plots) and PennyLane only for its ansatz backend.
 """
 
 from __future__ import annotations
 
 import argparse
+import json
 import os
+import sys
+from typing import Optional
 
 import numpy as np
 
+from . import profiling
 from .plots import (
     plot_bloch_trajectory,
     plot_exact_vs_variational,
     plot_parameter_evolution,
 )
+from .sweep import build_grid, run_sweep
 from .trainer import run_full_simulation
 
 
-def parse_args() -> argparse.Namespace:
-    """CLI argument parser."""
+def _param_vector(text: str) -> list:
+    """Parse a comma-separated parameter vector such as "0.1,0.2,0.3"."""
+
+    return [float(value) for value in text.split(",")]
+
+
+_RUN_DEFAULTS = {"tmax": 5.0, "dt": 0.05}
+
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    """CLI argument parser.
+
+    The single-run options (--tmax, --dt, --profile, --no-plots) belong to
+    the root command; the `sweep` subcommand has its own --tmax/--dt lists
+    (stored as sweep_tmax/sweep_dt) and rejects the root run options.
+    """
 
     parser = argparse.ArgumentParser(description="Run a tiny variational quantum simulator")
-    parser.add_argument("--tmax", type=float, default=5.0, help="Final time value")
-    parser.add_argument("--dt", type=float, default=0.05, help="Time step")
-    return parser.parse_args()
+    parser.add_argument("--tmax", type=float, default=None, help="Final time value (default: 5.0)")
+    parser.add_argument("--dt", type=float, default=None, help="Time step (default: 0.05)")
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage timing breakdown")
+    parser.add_argument("--no-plots", action="store_true", help="Skip writing the SVG figures")
+    subparsers = parser.add_subparsers(dest="command")
+
+    sweep = subparsers.add_parser("sweep", help="Run a parameter sweep on a process pool")
+    sweep.add_argument(
+        "--tmax", dest="sweep_tmax", type=float, nargs="+", default=[5.0], help="Final time values"
+    )
+    sweep.add_argument("--dt", dest="sweep_dt", type=float, nargs="+", default=[0.05], help="Time steps")
+    sweep.add_argument(
+        "--init-params",
+        type=_param_vector,
+        nargs="+",
+        default=None,
+        help='Initial parameter vectors, e.g. "0.05,0.05,0.05"',
+    )
+    sweep.add_argument("--z-amplitude", type=float, nargs="+", default=[1.0], help="Z coefficient amplitudes")
+    sweep.add_argument("--x-amplitude", type=float, nargs="+", default=[1.0], help="X coefficient amplitudes")
+    sweep.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    sweep.add_argument("--output", default=None, help="Optional JSON-lines file for the summaries")
+    args = parser.parse_args(argv)
+
+    run_options = [name for name in _RUN_DEFAULTS if getattr(args, name) is not None]
+    run_options += [name for name in ("profile", "no_plots") if getattr(args, name)]
+    if args.command == "sweep" and run_options:
+        flags = ", ".join("--" + name.replace("_", "-") for name in run_options)
+        parser.error(f"{flags} only apply to a single run; pass sweep options after 'sweep'")
+    for name, default in _RUN_DEFAULTS.items():
+        if getattr(args, name) is None:
+            setattr(args, name, default)
+    return args
+
+
+def run_sweep_command(args: argparse.Namespace) -> None:
+    """Run the `sweep` subcommand and stream summaries to stdout."""
+
+    coefficients = [(z, x) for z in args.z_amplitude for x in args.x_amplitude]
+    configs = build_grid(args.sweep_tmax, args.sweep_dt, args.init_params, coefficients)
+    print(f"Running {len(configs)} configurations", file=sys.stderr)
+    sink = open(args.output, "w") if args.output else None
+    try:
+        for summary in run_sweep(configs, max_workers=args.workers):
+            line = json.dumps(summary)
+            print(line, flush=True)
+            if sink:
+                sink.write(line + "\n")
+                sink.flush()
+    finally:
+        if sink:
+            sink.close()
 
 
 def main() -> None:
     args = parse_args()
+    if args.command == "sweep":
+        run_sweep_command(args)
+        return
+    if args.profile:
+        profiling.enable()
     results = run_full_simulation(t_span=args.tmax, dt=args.dt)
 
-    os.makedirs("examples", exist_ok=True)
-    plot_exact_vs_variational(
-        results["times"], results["fidelities"], "examples/vqs_exact_vs_variational.svg"
-    )
-    plot_parameter_evolution(
-        results["times"], results["param_history"], "examples/vqs_parameter_evolution.svg"
-    )
-    plot_bloch_trajectory(results["variational_states"], "examples/vqs_state_trajectory_bloch.svg")
+    if not args.no_plots:
+        os.makedirs("examples", exist_ok=True)
+        with profiling.stage("plots.render"):
+            plot_exact_vs_variational(
+                results["times"], results["fidelities"], "examples/vqs_exact_vs_variational.svg"
+            )
+            plot_parameter_evolution(
+                results["times"], results["param_history"], "examples/vqs_parameter_evolution.svg"
+            )
+            plot_bloch_trajectory(results["variational_states"], "examples/vqs_state_trajectory_bloch.svg")
 
     avg_fid = np.mean(results["fidelities"])
     min_fid = np.min(results["fidelities"])
@@ -47,10 +128,15 @@ def main() -> None:
     print(f"Time grid: 0 → {args.tmax} with dt={args.dt}")
     print(f"Average fidelity vs exact: {avg_fid:.4f}")
     print(f"Worst-case fidelity: {min_fid:.4f}")
-    print("SVG plots saved in examples/:")
-    print(" - vqs_exact_vs_variational.svg")
-    print(" - vqs_parameter_evolution.svg")
-    print(" - vqs_state_trajectory_bloch.svg")
+    if not args.no_plots:
+        print("SVG plots saved in examples/:")
+        print(" - vqs_exact_vs_variational.svg")
+        print(" - vqs_parameter_evolution.svg")
+        print(" - vqs_state_trajectory_bloch.svg")
+    if args.profile:
+        print()
+        print("Per-stage profile:")
+        print(profiling.format_table())
 
 
 if __name__ == "__main__":
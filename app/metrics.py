@@ -0,0 +1,121 @@
+"""metrics.py
+Vectorized comparison metrics for pure-state trajectories.
+
+Every function takes statevectors with shape (..., dim): a single state, a
+(T, dim) trajectory, or batches such as (configs, T, dim) from a sweep or
+(T, M, dim) from an ensemble run. Leading axes broadcast, and each metric is
+computed with one NumPy expression instead of a Python loop over time.
+
+    fidelity        |<psi|phi>|^2
+    trace_distance  sqrt(1 - F), the trace distance of two pure states
+    bloch_error     distance between the per-qubit reduced Bloch vectors
+    energy_error    <psi|H|psi> - <phi|H|phi> for H of shape (..., dim, dim)
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+
+def overlap(psi: np.ndarray, phi: np.ndarray) -> np.ndarray:
+    """Return <psi|phi> over the last axis."""
+
+    return np.einsum("...i,...i->...", np.conj(psi), phi)
+
+
+def fidelity(psi: np.ndarray, phi: np.ndarray) -> np.ndarray:
+    """Return |<psi|phi>|^2 with the broadcast leading shape."""
+
+    return np.abs(overlap(psi, phi)) ** 2
+
+
+def trace_distance(psi: np.ndarray, phi: np.ndarray) -> np.ndarray:
+    """Return the trace distance sqrt(1 - |<psi|phi>|^2) of pure states."""
+
+    return np.sqrt(np.clip(1.0 - fidelity(psi, phi), 0.0, None))
+
+
+def bloch_vectors(states: np.ndarray) -> np.ndarray:
+    """Reduced single-qubit Bloch vectors of every qubit.
+
+    Args:
+        states: Complex array with shape (..., 2**n_qubits).
+
+    Returns:
+        Real array with shape (..., n_qubits, 3) holding (x, y, z); for one
+        qubit this matches `plots.states_to_bloch` with an extra axis.
+    """
+
+    states = np.asarray(states)
+    dim = states.shape[-1]
+    n_qubits = dim.bit_length() - 1
+    vectors = []
+    for qubit in range(n_qubits):
+        # Split the index into (wires before, this wire, wires after)
+        split = states.reshape(states.shape[:-1] + (2**qubit, 2, dim // 2 ** (qubit + 1)))
+        a, b = split[..., 0, :], split[..., 1, :]
+        coherence = np.einsum("...ij,...ij->...", np.conj(a), b)
+        z = np.sum(np.abs(a) ** 2 - np.abs(b) ** 2, axis=(-2, -1))
+        vectors.append(np.stack([2 * np.real(coherence), 2 * np.imag(coherence), z], axis=-1))
+    return np.stack(vectors, axis=-2)
+
+
+def bloch_error(psi: np.ndarray, phi: np.ndarray) -> np.ndarray:
+    """Euclidean distance between the stacked per-qubit Bloch vectors."""
+
+    difference = bloch_vectors(psi) - bloch_vectors(phi)
+    return np.sqrt(np.sum(difference**2, axis=(-2, -1)))
+
+
+def energy(states: np.ndarray, H: np.ndarray) -> np.ndarray:
+    """Return Re<psi|H|psi> for states (..., dim) and matrices (..., dim, dim).
+
+    A stacked H such as `TimeDependentPauliHamiltonian.matrix(times)` pairs
+    one matrix with every time step.
+    """
+
+    return np.real(np.einsum("...i,...ij,...j->...", np.conj(states), H, states))
+
+
+def energy_error(psi: np.ndarray, phi: np.ndarray, H: np.ndarray) -> np.ndarray:
+    """Return <psi|H|psi> - <phi|H|phi>."""
+
+    return energy(psi, H) - energy(phi, H)
+
+
+def trajectory_metrics(psi: np.ndarray, phi: np.ndarray, H: Optional[np.ndarray] = None) -> dict:
+    """Compute every metric of this module for two trajectories.
+
+    Args:
+        psi: Trajectory with shape (..., dim), e.g. the variational states.
+        phi: Reference trajectory broadcastable against `psi`.
+        H: Optional Hamiltonian matrices (..., dim, dim) for "energy_errors".
+
+    Returns:
+        Dict with "fidelities", "trace_distances", "bloch_errors" and, when
+        H is given, "energy_errors".
+    """
+
+    fidelities = fidelity(psi, phi)
+    results = {
+        "fidelities": fidelities,
+        "trace_distances": np.sqrt(np.clip(1.0 - fidelities, 0.0, None)),
+        "bloch_errors": bloch_error(psi, phi),
+    }
+    if H is not None:
+        results["energy_errors"] = energy_error(psi, phi, H)
+    return results
+
+
+__all__ = [
+    "overlap",
+    "fidelity",
+    "trace_distance",
+    "bloch_vectors",
+    "bloch_error",
+    "energy",
+    "energy_error",
+    "trajectory_metrics",
+]
@@ -2,19 +2,102 @@
 Utility functions for generating SVG plots used in the examples folder. All
 functions are lightweight and rely on matplotlib with explicit `format="svg"`
 so that the repository contains only text-based vector graphics.
+
+Long trajectories are decimated before plotting (at most `max_points` points
+per curve) so that rendering time and SVG size stay bounded. "uniform" keeps
+evenly spaced samples; "curvature" spends the point budget where the curve
+bends the most.
+
+matplotlib is imported on the first plot call, so `states_to_bloch` and
+`decimate` stay cheap to import.
 """
 
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
 import numpy as np
 
+DECIMATION_MODES = ("uniform", "curvature")
+
+
+def _pyplot():
+    """Import matplotlib.pyplot on first use."""
+
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def states_to_bloch(states: np.ndarray) -> np.ndarray:
+    """Convert single-qubit statevectors [a, b] to Bloch coordinates.
+
+    Args:
+        states: Complex array with shape (..., 2).
+
+    Returns:
+        Real array with shape (..., 3) holding (x, y, z).
+    """
+
+    states = np.asarray(states)
+    a, b = states[..., 0], states[..., 1]
+    overlap = np.conj(a) * b
+    z = np.abs(a) ** 2 - np.abs(b) ** 2
+    return np.stack([2 * np.real(overlap), 2 * np.imag(overlap), z], axis=-1)
+
+
+def decimate(curve: np.ndarray, max_points: int, mode: str = "uniform") -> np.ndarray:
+    """Choose at most `max_points` indices of a sampled curve to plot.
+
+    Args:
+        curve: Array with shape (N, d); each column is rescaled to [0, 1]
+            before measuring lengths and angles.
+        max_points: Point budget (the first and last points are always kept).
+        mode: One of `DECIMATION_MODES`.
+
+    Returns:
+        Sorted integer indices into the curve.
+    """
+
+    if mode not in DECIMATION_MODES:
+        raise ValueError(f"Unknown decimation mode '{mode}', expected one of {DECIMATION_MODES}")
+    num_points = len(curve)
+    if num_points <= max_points:
+        return np.arange(num_points)
+    if mode == "uniform":
+        return np.unique(np.linspace(0, num_points - 1, max_points).round().astype(int))
+
+    curve = np.asarray(curve, dtype=float).reshape(num_points, -1)
+    span = np.ptp(curve, axis=0)
+    scaled = (curve - curve.min(axis=0)) / np.where(span > 0, span, 1.0)
+    segments = np.diff(scaled, axis=0)
+    lengths = np.linalg.norm(segments, axis=1)
+    # Turning angle between consecutive segments, attributed to the vertex
+    dots = np.einsum("ij,ij->i", segments[:-1], segments[1:])
+    cosines = dots / np.maximum(lengths[:-1] * lengths[1:], 1e-300)
+    angles = np.arccos(np.clip(cosines, -1.0, 1.0))
+    # Half the weight follows arc length, half follows curvature, so flat
+    # stretches still get some samples.
+    weight = 0.5 * lengths / max(lengths.sum(), 1e-300)
+    weight[1:] += 0.5 * angles / max(angles.sum(), 1e-300)
+    cumulative = np.concatenate([[0.0], np.cumsum(weight)])
+    targets = np.linspace(0.0, cumulative[-1], max_points)
+    indices = np.searchsorted(cumulative, targets).clip(0, num_points - 1)
+    return np.unique(np.concatenate([[0], indices, [num_points - 1]]))
+
 
-def plot_exact_vs_variational(times: np.ndarray, fidelities: np.ndarray, output_path: str) -> None:
+def plot_exact_vs_variational(
+    times: np.ndarray,
+    fidelities: np.ndarray,
+    output_path: str,
+    max_points: int = 2000,
+    decimation: str = "uniform",
+) -> None:
     """Plot fidelity between exact and variational trajectories over time."""
 
+    times, fidelities = np.asarray(times), np.asarray(fidelities)
+    keep = decimate(np.column_stack([times, fidelities]), max_points, decimation)
+    plt = _pyplot()
     plt.figure(figsize=(6, 4))
-    plt.plot(times, fidelities, label="Fidelity |⟨ψ_var|ψ_exact⟩|²", color="purple")
+    plt.plot(times[keep], fidelities[keep], label="Fidelity |⟨ψ_var|ψ_exact⟩|²", color="purple")
     plt.xlabel("Time")
     plt.ylabel("Fidelity")
     plt.ylim(0, 1.05)
@@ -26,12 +109,21 @@ def plot_exact_vs_variational(times: np.ndarray, fidelities: np.ndarray, output_
     plt.close()
 
 
-def plot_parameter_evolution(times: np.ndarray, param_history: np.ndarray, output_path: str) -> None:
+def plot_parameter_evolution(
+    times: np.ndarray,
+    param_history: np.ndarray,
+    output_path: str,
+    max_points: int = 2000,
+    decimation: str = "uniform",
+) -> None:
     """Plot how each parameter changes over time."""
 
+    times, param_history = np.asarray(times), np.asarray(param_history)
+    keep = decimate(np.column_stack([times, param_history]), max_points, decimation)
+    plt = _pyplot()
     plt.figure(figsize=(6, 4))
     for idx in range(param_history.shape[1]):
-        plt.plot(times, param_history[:, idx], label=fr"θ{idx + 1}")
+        plt.plot(times[keep], param_history[keep, idx], label=fr"θ{idx + 1}")
     plt.xlabel("Time")
     plt.ylabel("Parameter value (rad)")
     plt.title("Variational Parameter Evolution")
@@ -42,18 +134,15 @@ def plot_parameter_evolution(times: np.ndarray, param_history: np.ndarray, outpu
     plt.close()
 
 
-def plot_bloch_trajectory(states: np.ndarray, output_path: str) -> None:
+def plot_bloch_trajectory(
+    states: np.ndarray, output_path: str, max_points: int = 2000, decimation: str = "uniform"
+) -> None:
     """Plot the path of the state on the Bloch sphere (projected to xy and z)."""
 
-    # Convert statevector [a, b] to Bloch coordinates
-    bloch_vectors = []
-    for a, b in states:
-        sx = 2 * np.real(np.conj(a) * b)
-        sy = 2 * np.imag(np.conj(b) * a)
-        sz = np.abs(a) ** 2 - np.abs(b) ** 2
-        bloch_vectors.append([sx, sy, sz])
-    bloch_vectors = np.array(bloch_vectors)
+    bloch_vectors = states_to_bloch(states)
+    bloch_vectors = bloch_vectors[decimate(bloch_vectors, max_points, decimation)]
 
+    plt = _pyplot()
     fig = plt.figure(figsize=(6, 4))
     ax = fig.add_subplot(111, projection="3d")
     ax.plot(bloch_vectors[:, 0], bloch_vectors[:, 1], bloch_vectors[:, 2], color="teal", lw=2)
@@ -77,4 +166,7 @@ __all__ = [
     "plot_exact_vs_variational",
     "plot_parameter_evolution",
     "plot_bloch_trajectory",
+    "states_to_bloch",
+    "decimate",
+    "DECIMATION_MODES",
 ]
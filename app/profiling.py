@@ -0,0 +1,150 @@
+"""profiling.py
+Opt-in hot-path instrumentation: per-stage timers, call counters and
+duration histograms.
+
+Code marks a stage with
+    with stage("ansatz.jacobian"):
+        ...
+While profiling is disabled (the default) `stage` returns one shared no-op
+context manager, so the cost is a function call and a flag check. After
+`enable()`, every stage records its call count, total/min/max time and a
+histogram over decade buckets (1 µs ... 10 s). `format_table()` renders a
+per-stage breakdown such as the one printed by `python -m app.main --profile`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+
+import numpy as np
+
+# Histogram bucket edges in seconds: <1us, 1-10us, ..., 1-10s, >=10s
+BUCKET_EDGES = 10.0 ** np.arange(-6, 2)
+
+_enabled = False
+_stats = {}
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class _StageStats:
+    __slots__ = ("calls", "total", "minimum", "maximum", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+        self.histogram = np.zeros(len(BUCKET_EDGES) + 1, dtype=int)
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        self.histogram[np.searchsorted(BUCKET_EDGES, seconds, side="right")] += 1
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stats = _stats.get(self.name)
+        if stats is None:
+            stats = _stats[self.name] = _StageStats()
+        stats.add(elapsed)
+        return False
+
+
+def enable() -> None:
+    """Start recording stages."""
+
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording stages (collected statistics are kept)."""
+
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Drop all collected statistics."""
+
+    _stats.clear()
+
+
+def stage(name: str):
+    """Context manager timing one execution of the stage `name`."""
+
+    if not _enabled:
+        return _NULL_CONTEXT
+    return _Timer(name)
+
+
+def count(name: str) -> None:
+    """Record an event with zero duration (a plain call counter)."""
+
+    if _enabled:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = _StageStats()
+        stats.calls += 1
+
+
+def report() -> dict:
+    """Return the collected statistics keyed by stage name."""
+
+    return {
+        name: {
+            "calls": stats.calls,
+            "total_seconds": stats.total,
+            "mean_seconds": stats.total / stats.calls if stats.calls else 0.0,
+            "min_seconds": stats.minimum if stats.minimum != float("inf") else 0.0,
+            "max_seconds": stats.maximum,
+            "histogram": stats.histogram.tolist(),
+        }
+        for name, stats in _stats.items()
+    }
+
+
+def format_table() -> str:
+    """Render the statistics as a text table sorted by total time."""
+
+    rows = sorted(report().items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+    grand_total = sum(row["total_seconds"] for _, row in rows) or 1.0
+    lines = [f"{'stage':<28}{'calls':>10}{'total [s]':>12}{'mean [us]':>12}{'max [us]':>12}{'share':>8}"]
+    for name, row in rows:
+        lines.append(
+            f"{name:<28}{row['calls']:>10}{row['total_seconds']:>12.4f}"
+            f"{1e6 * row['mean_seconds']:>12.1f}{1e6 * row['max_seconds']:>12.1f}"
+            f"{100 * row['total_seconds'] / grand_total:>7.1f}%"
+        )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "enable",
+    "disable",
+    "is_enabled",
+    "reset",
+    "stage",
+    "count",
+    "report",
+    "format_table",
+    "BUCKET_EDGES",
+]
@@ -0,0 +1,253 @@
+"""shots.py
+Measurement-based (finite-shot) estimation of the McLachlan system.
+
+On a sampling backend every entry of A and C is read out with Hadamard-test
+circuits whose ancilla returns +1 with probability (1 + v) / 2, v in [-1, 1]:
+    A_ij = Re<dpsi_i|dpsi_j>               one circuit, scale |dpsi_i| |dpsi_j|
+    C_i  = sum_k h_k Im<dpsi_i|P_k|psi>    one circuit per Pauli term P_k,
+                                           scale |h_k| |dpsi_i|
+A circuit with scale s contributes s times the mean of its +-1 outcomes, so
+a single shot has variance s^2 (1 - v^2). In imaginary-time mode the C
+circuits measure -h_k Re<dpsi_i|P_k|psi> instead; the energy projection
+E Re<dpsi_i|psi> vanishes for a normalized ansatz and needs no circuit.
+
+`ShotEstimator` draws these outcomes binomially from the exact statevector
+quantities. Each step first spends a pilot fraction of the shot budget
+uniformly, then hands out the rest proportionally to the estimated standard
+deviation of every circuit (Neyman allocation), which minimizes the summed
+variance of all entries for a fixed budget. The entry variances are
+propagated linearly to a standard error on theta_dot.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from .hamiltonian import as_pauli_hamiltonian
+from .profiling import stage
+from .vqs_core import StepContext, _as_solver
+
+
+@dataclass(frozen=True)
+class ShotEstimate:
+    """Sampled McLachlan system of one step.
+
+    Attributes:
+        A: Estimated A matrix (symmetric, without diagonal shift).
+        C: Estimated C vector.
+        A_variance: Variance of every entry of `A`.
+        C_variance: Variance of every entry of `C`.
+        shots: Shots spent on every Hadamard-test circuit.
+    """
+
+    A: np.ndarray
+    C: np.ndarray
+    A_variance: np.ndarray
+    C_variance: np.ndarray
+    shots: np.ndarray
+
+
+def allocate_shots(weights: np.ndarray, total: int) -> np.ndarray:
+    """Split `total` shots proportionally to non-negative `weights`.
+
+    Rounding uses largest remainders, so the result always sums to `total`.
+    All-zero weights fall back to a uniform split.
+
+    Returns:
+        Integer array with the same shape as `weights`.
+    """
+
+    weights = np.asarray(weights, dtype=float)
+    if weights.sum() <= 0.0:
+        weights = np.ones_like(weights)
+    ideal = total * weights / weights.sum()
+    shots = np.floor(ideal).astype(int)
+    leftover = total - shots.sum()
+    shots[np.argsort(shots - ideal)[:leftover]] += 1
+    return shots
+
+
+def hadamard_test_circuits(
+    ctx: StepContext, hamiltonian: Optional[Callable] = None, mode: str = "real"
+) -> tuple:
+    """List the Hadamard-test circuits that measure A and C at `ctx`.
+
+    Entries are flattened as the upper triangle of A (row-major) followed by
+    C. Circuits with zero scale (e.g. a vanishing coefficient h_k) are
+    dropped since their contribution is known to be zero.
+
+    Returns:
+        Tuple (values, scales, targets): the exact ancilla expectation v of
+        every circuit, its scale s, and the flat entry it contributes to.
+    """
+
+    model = as_pauli_hamiltonian(hamiltonian)
+    derivs = np.asarray(ctx.derivs)
+    num_params = derivs.shape[0]
+    norms = np.linalg.norm(derivs, axis=1)
+
+    rows, cols = np.triu_indices(num_params)
+    a_values = np.real(np.conj(derivs) @ derivs.T)[rows, cols]
+    a_scales = norms[rows] * norms[cols]
+
+    coeffs = np.asarray(model.coefficients(ctx.t), dtype=float)
+    term_states = np.array([term @ ctx.state for term in model.term_matrices])
+    overlaps = np.conj(derivs) @ term_states.T
+    # c_values[i, k] = h_k Im<dpsi_i|P_k|psi>, or -h_k Re<...> in imaginary time
+    c_values = coeffs * (-np.real(overlaps) if mode == "imaginary" else np.imag(overlaps))
+    c_scales = np.outer(norms, np.abs(coeffs))
+    c_targets = np.repeat(np.arange(num_params), len(coeffs)) + len(rows)
+
+    values = np.concatenate([a_values, c_values.ravel()])
+    scales = np.concatenate([a_scales, c_scales.ravel()])
+    targets = np.concatenate([np.arange(len(rows)), c_targets])
+    keep = scales > 0.0
+    ratios = np.clip(values[keep] / scales[keep], -1.0, 1.0)
+    return ratios, scales[keep], targets[keep]
+
+
+@dataclass
+class ShotEstimator:
+    """Finite-shot estimator of A and C with variance-aware shot allocation.
+
+    Attributes:
+        shots_per_step: Total shot budget for one McLachlan system.
+        pilot_fraction: Share of the budget spread uniformly over all
+            circuits to estimate their variances before the rest is
+            allocated.
+        seed: Seed of the random generator `rng`.
+    """
+
+    shots_per_step: int = 10000
+    pilot_fraction: float = 0.2
+    seed: Optional[int] = None
+    rng: np.random.Generator = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if not 0.0 < self.pilot_fraction <= 1.0:
+            raise ValueError("pilot_fraction must lie in (0, 1]")
+        self.rng = np.random.default_rng(self.seed)
+
+    def _sample(self, ratios: np.ndarray, shots: np.ndarray) -> np.ndarray:
+        """Number of +1 ancilla outcomes for every circuit."""
+
+        return self.rng.binomial(shots, 0.5 * (1.0 + ratios))
+
+    def estimate(
+        self, ctx: StepContext, hamiltonian: Optional[Callable] = None, mode: str = "real"
+    ) -> ShotEstimate:
+        """Sample A and C at `ctx` within the shot budget.
+
+        Args:
+            ctx: Evaluated step context.
+            hamiltonian: Pauli-decomposed Hamiltonian; None (or the
+                single-qubit helpers) selects the built-in model.
+            mode: "real" or "imaginary" time (see `vqs_core.MODES`).
+
+        Returns:
+            ShotEstimate with the sampled system and its variances.
+        """
+
+        ratios, scales, targets = hadamard_test_circuits(ctx, hamiltonian, mode)
+        num_circuits = len(ratios)
+        if self.shots_per_step < num_circuits:
+            raise ValueError(f"shots_per_step must be at least the number of circuits ({num_circuits})")
+
+        pilot = max(num_circuits, int(round(self.pilot_fraction * self.shots_per_step)))
+        shots = allocate_shots(np.ones(num_circuits), pilot)
+        hits = self._sample(ratios, shots)
+        # Laplace smoothing keeps a circuit that showed only one outcome in the
+        # pilot from being assigned zero variance.
+        p_pilot = (hits + 1.0) / (shots + 2.0)
+        std = scales * 2.0 * np.sqrt(p_pilot * (1.0 - p_pilot))
+        extra = allocate_shots(std, self.shots_per_step - pilot)
+        hits = hits + self._sample(ratios, extra)
+        shots = shots + extra
+
+        p_hat = hits / shots
+        means = scales * (2.0 * p_hat - 1.0)
+        p_smooth = (hits + 1.0) / (shots + 2.0)
+        variances = scales**2 * 4.0 * p_smooth * (1.0 - p_smooth) / shots
+
+        num_params = ctx.derivs.shape[0]
+        num_entries = num_params * (num_params + 1) // 2 + num_params
+        flat = np.bincount(targets, weights=means, minlength=num_entries)
+        flat_var = np.bincount(targets, weights=variances, minlength=num_entries)
+        return ShotEstimate(
+            A=_symmetric(flat[:-num_params], num_params),
+            C=flat[-num_params:],
+            A_variance=_symmetric(flat_var[:-num_params], num_params),
+            C_variance=flat_var[-num_params:],
+            shots=shots,
+        )
+
+
+def _symmetric(upper: np.ndarray, size: int) -> np.ndarray:
+    """Rebuild a symmetric matrix from its row-major upper triangle."""
+
+    matrix = np.zeros((size, size))
+    matrix[np.triu_indices(size)] = upper
+    return matrix + np.triu(matrix, 1).T
+
+
+def theta_dot_std(
+    A: np.ndarray, theta_dot: np.ndarray, A_variance: np.ndarray, C_variance: np.ndarray, solver: Any = None
+) -> np.ndarray:
+    """Propagate independent entry variances of A and C to theta_dot.
+
+    To first order d(theta_dot) = A^{-1} (dC - dA theta_dot), where the
+    symmetric dA moves entries (i, j) and (j, i) together. The response
+    directions of all entries are solved as the columns of one matrix, so
+    A is decomposed only once.
+
+    Returns:
+        Standard deviation of every component of theta_dot.
+    """
+
+    num_params = A.shape[0]
+    rows, cols = np.triu_indices(num_params)
+    # Column i < P perturbs C_i; column P + m perturbs A[rows[m], cols[m]]
+    a_columns = num_params + np.arange(len(rows))
+    directions = np.zeros((num_params, num_params + len(rows)))
+    directions[:, :num_params] = np.eye(num_params)
+    directions[rows, a_columns] = -theta_dot[cols]
+    off = rows != cols
+    directions[cols[off], a_columns[off]] = -theta_dot[rows[off]]
+    variances = np.concatenate([C_variance, A_variance[rows, cols]])
+    responses = _as_solver(solver).solve(A, directions)[0]
+    return np.sqrt(responses**2 @ variances)
+
+
+def shot_solve_step(
+    ctx: StepContext,
+    estimator: ShotEstimator,
+    hamiltonian: Optional[Callable] = None,
+    solver: Any = None,
+    mode: str = "real",
+) -> tuple:
+    """Finite-shot counterpart of `vqs_core.solve_step`.
+
+    Returns:
+        Tuple (theta_dot, condition number of the sampled A, standard error
+        of theta_dot).
+    """
+
+    with stage("vqs.build_A_C"):
+        estimate = estimator.estimate(ctx, hamiltonian, mode)
+    with stage("vqs.solve"):
+        theta_dot, condition = _as_solver(solver).solve(estimate.A, estimate.C)
+        std = theta_dot_std(estimate.A, theta_dot, estimate.A_variance, estimate.C_variance, solver)
+    return theta_dot, condition, std
+
+
+__all__ = [
+    "ShotEstimate",
+    "ShotEstimator",
+    "allocate_shots",
+    "hadamard_test_circuits",
+    "shot_solve_step",
+    "theta_dot_std",
+]
@@ -2,56 +2,341 @@
 Classical reference simulator using matrix exponentials. The goal is to provide
 an exact trajectory so that the variational approximation can be compared
 quantitatively.
+
+Four engines are available through `run_exact_sim(..., engine=...)`:
+    "expm"     one scipy.linalg.expm call per time step
+    "su2"      closed-form single-qubit unitaries for the whole grid at once,
+               chained with a cumulative batched matrix product
+    "krylov"   sparse H(t) applied through scipy's expm_multiply, so the
+               2^n x 2^n unitary is never materialized (multi-qubit models)
+    "magnus4"  fourth-order Magnus propagator exp(Omega) built from H at the
+               two Gauss-Legendre nodes of every step
+
+"expm", "krylov" and "su2" sample H at the left endpoint of each step and are
+only first-order accurate in dt for a time-dependent H(t); "magnus4" is
+fourth-order and reaches the same accuracy with much larger steps.
+
+The "expm", "krylov" and "magnus4" engines accept a custom `hamiltonian(t)`
+callable; "su2" is specific to the built-in single-qubit Hamiltonian. Without
+a custom Hamiltonian, "magnus4" uses closed-form SU(2) exponentials for the
+whole grid at once.
+
+Every engine also evolves an ensemble: a batch of initial states or a
+density matrix is propagated as a single block of columns.
 """
 
 from __future__ import annotations
 
+from functools import partial
+from typing import Callable, Optional
+
 import numpy as np
+from scipy import sparse
 from scipy.linalg import expm
+from scipy.sparse.linalg import expm_multiply
+
+from .hamiltonian import (
+    TimeDependentPauliHamiltonian,
+    coefficient_arrays,
+    hamiltonian_matrix,
+    hamiltonian_sparse,
+)
+from .profiling import stage
+from .sinks import allocate
 
-from .hamiltonian import hamiltonian_matrix
+ENGINES = ("expm", "su2", "krylov", "magnus4")
 
+_PAULI_Z = np.array([[1.0, 0.0], [0.0, -1.0]], dtype=complex)
+_PAULI_X = np.array([[0.0, 1.0], [1.0, 0.0]], dtype=complex)
+_PAULI_Y = np.array([[0.0, -1.0j], [1.0j, 0.0]], dtype=complex)
 
-def exact_step(state: np.ndarray, t: float, dt: float) -> np.ndarray:
+# Gauss-Legendre nodes on [0, 1] used by the fourth-order Magnus expansion
+_GAUSS_NODES = (0.5 - np.sqrt(3.0) / 6.0, 0.5 + np.sqrt(3.0) / 6.0)
+
+
+def exact_step(state: np.ndarray, t: float, dt: float, hamiltonian: Optional[Callable] = None) -> np.ndarray:
     """Apply one exact time-evolution step using exp(-i H dt).
 
     Args:
         state: Current statevector.
         t: Current time value.
         dt: Time step size.
+        hamiltonian: Optional callable returning H(t); defaults to
+            `hamiltonian_matrix`.
 
     Returns:
         Updated statevector after applying the unitary.
     """
 
-    H = hamiltonian_matrix(t)
-    unitary = expm(-1j * H * dt)
-    return unitary @ state
+    with stage("exact.hamiltonian"):
+        H = (hamiltonian or hamiltonian_matrix)(t)
+        if sparse.issparse(H):
+            H = H.toarray()
+    with stage("exact.expm"):
+        unitary = expm(-1j * H * dt)
+        return unitary @ state
 
 
-def run_exact_sim(initial_state: np.ndarray, t_span: float, dt: float) -> np.ndarray:
-    """Run exact simulation over a time grid.
+def krylov_step(state: np.ndarray, t: float, dt: float, hamiltonian: Optional[Callable] = None) -> np.ndarray:
+    """Apply exp(-i H dt) to `state` without forming the unitary.
 
     Args:
-        initial_state: Starting state vector.
-        t_span: Final time value.
+        state: Current statevector.
+        t: Current time value.
         dt: Time step size.
+        hamiltonian: Optional callable returning a sparse H(t); defaults to
+            `hamiltonian_sparse`.
 
     Returns:
-        Array of shape (num_steps, state_dim) with the full trajectory.
+        Updated statevector.
     """
 
-    num_steps = int(t_span / dt) + 1
-    states = np.zeros((num_steps, initial_state.shape[0]), dtype=complex)
-    states[0] = initial_state
-    current = initial_state
+    with stage("exact.hamiltonian"):
+        H = sparse.csr_matrix((hamiltonian or hamiltonian_sparse)(t))
+    with stage("exact.expm_multiply"):
+        return expm_multiply(-1j * dt * H, state)
+
+
+def magnus4_generator(t: float, dt: float, hamiltonian: Optional[Callable] = None):
+    """Return the fourth-order Magnus exponent Omega for the step [t, t + dt].
+
+    With H1, H2 evaluated at the Gauss nodes t + (1/2 -+ sqrt(3)/6) dt,
+        Omega = -i dt/2 (H1 + H2) - sqrt(3)/12 dt^2 [H2, H1]
+    and exp(Omega) matches the exact propagator up to O(dt^5) per step.
+
+    Args:
+        t: Start of the step.
+        dt: Time step size.
+        hamiltonian: Optional callable returning H(t) (dense or sparse);
+            defaults to `hamiltonian_matrix`.
+
+    Returns:
+        Anti-Hermitian matrix Omega, sparse if H is sparse.
+    """
+
+    hamiltonian = hamiltonian or hamiltonian_matrix
+    H1, H2 = (hamiltonian(t + node * dt) for node in _GAUSS_NODES)
+    commutator = H2 @ H1 - H1 @ H2
+    return -0.5j * dt * (H1 + H2) - np.sqrt(3.0) / 12.0 * dt**2 * commutator
+
+
+def magnus4_step(
+    state: np.ndarray, t: float, dt: float, hamiltonian: Optional[Callable] = None
+) -> np.ndarray:
+    """Apply exp(Omega) from `magnus4_generator` to `state`.
+
+    Dense generators are exponentiated with scipy.linalg.expm; sparse ones
+    are applied with expm_multiply without forming the propagator.
+    """
+
+    with stage("exact.hamiltonian"):
+        omega = magnus4_generator(t, dt, hamiltonian)
+    if sparse.issparse(omega):
+        with stage("exact.expm_multiply"):
+            return expm_multiply(sparse.csr_matrix(omega), state)
+    with stage("exact.expm"):
+        return expm(omega) @ state
+
+
+def magnus4_su2_unitaries(times: np.ndarray, dt: float) -> np.ndarray:
+    """Closed-form exp(Omega) of the built-in single-qubit model for every t.
+
+    For H = a Z + b X, [Z, X] = 2i Y, so Omega = -i (vz Z + vx X + vy Y) with
+        vz = dt (a1 + a2) / 2,  vx = dt (b1 + b2) / 2,
+        vy = sqrt(3)/6 dt^2 (a2 b1 - a1 b2),
+    and exp(Omega) = cos(r) I - i sin(r) / r (vz Z + vx X + vy Y), r = |v|.
+
+    Args:
+        times: Left endpoints of each step, shape (T,).
+        dt: Time step size.
+
+    Returns:
+        Complex array with shape (T, 2, 2).
+    """
+
+    times = np.asarray(times, dtype=float)
+    a1, b1 = coefficient_arrays(times + _GAUSS_NODES[0] * dt)
+    a2, b2 = coefficient_arrays(times + _GAUSS_NODES[1] * dt)
+    vz = 0.5 * dt * (a1 + a2)
+    vx = 0.5 * dt * (b1 + b2)
+    vy = np.sqrt(3.0) / 6.0 * dt**2 * (a2 * b1 - a1 * b2)
+    r = np.sqrt(vz**2 + vx**2 + vy**2)
+    generator = vz[:, None, None] * _PAULI_Z + vx[:, None, None] * _PAULI_X + vy[:, None, None] * _PAULI_Y
+    sin_over_r = np.sinc(r / np.pi)
+    return np.cos(r)[:, None, None] * np.eye(2) - 1j * sin_over_r[:, None, None] * generator
+
+
+def su2_step_unitaries(times: np.ndarray, dt: float) -> np.ndarray:
+    """Closed-form exp(-i H(t) dt) for every t in `times`.
+
+    For H = a Z + b X with r = sqrt(a^2 + b^2) the exponential is
+        cos(r dt) I - i sin(r dt) / r * H.
+
+    Args:
+        times: Left endpoints of each step, shape (T,).
+        dt: Time step size.
+
+    Returns:
+        Complex array with shape (T, 2, 2).
+    """
+
+    a, b = coefficient_arrays(times)
+    r = np.hypot(a, b)
+    cos_term = np.cos(r * dt)
+    # sin(r dt) / r written with np.sinc so that r = 0 is handled smoothly
+    sin_over_r = dt * np.sinc(r * dt / np.pi)
+    H = a[:, None, None] * _PAULI_Z + b[:, None, None] * _PAULI_X
+    return cos_term[:, None, None] * np.eye(2) - 1j * sin_over_r[:, None, None] * H
+
+
+def cumulative_products(unitaries: np.ndarray) -> np.ndarray:
+    """Return P_k = U_k @ ... @ U_0 for every k using a log-depth scan.
+
+    Args:
+        unitaries: Array with shape (T, d, d).
+
+    Returns:
+        Array with the same shape holding the running products.
+    """
+
+    products = np.array(unitaries, dtype=complex)
+    shift = 1
+    while shift < products.shape[0]:
+        # Each pass doubles the number of factors folded into every entry.
+        products[shift:] = products[shift:] @ products[:-shift]
+        shift *= 2
+    return products
+
+
+def _store(states, index, blocks: np.ndarray, layout: str) -> None:
+    """Write column blocks of shape (..., dim, M) into the trajectory array.
+
+    "single" keeps the only column, "batch" stores the M states as rows and
+    "density" rebuilds rho = B B^dagger from the square-root factor B.
+    """
+
+    if layout == "single":
+        states[index] = blocks[..., 0]
+    elif layout == "batch":
+        states[index] = np.swapaxes(blocks, -1, -2)
+    else:
+        states[index] = blocks @ np.conj(np.swapaxes(blocks, -1, -2))
+
+
+def _density_factor(rho: np.ndarray) -> np.ndarray:
+    """Return B with rho = B B^dagger, one column per non-zero eigenvalue."""
+
+    weights, vectors = np.linalg.eigh(rho)
+    keep = weights > 1e-12 * weights.max()
+    return vectors[:, keep] * np.sqrt(weights[keep])
+
+
+def _uncached(hamiltonian: Optional[Callable]) -> Optional[Callable]:
+    """Bypass the matrix cache of a Pauli model; steppers visit each time once."""
+
+    if isinstance(hamiltonian, TimeDependentPauliHamiltonian):
+        return partial(hamiltonian.sparse_matrix, cache=False)
+    return hamiltonian
+
+
+def _run_stepwise(
+    step_fn: Callable, states, columns: np.ndarray, layout: str, dt: float, hamiltonian: Optional[Callable]
+):
+    num_steps = states.shape[0]
+    hamiltonian = _uncached(hamiltonian)
+    norms = np.linalg.norm(columns, axis=0)
+    _store(states, 0, columns, layout)
+    current = columns
     for k in range(1, num_steps):
         t = (k - 1) * dt
-        current = exact_step(current, t, dt)
+        # One propagation for all columns: a matrix-matrix product for "expm"
+        current = step_fn(current, t, dt, hamiltonian)
         # normalize to reduce numerical drift
-        current = current / np.linalg.norm(current)
-        states[k] = current
+        current = current * (norms / np.linalg.norm(current, axis=0))
+        _store(states, k, current, layout)
+    return states
+
+
+def _run_su2(states, columns: np.ndarray, layout: str, dt: float, step_unitaries: Callable = None):
+    num_steps = states.shape[0]
+    _store(states, 0, columns, layout)
+    if num_steps > 1:
+        with stage("exact.su2_unitaries"):
+            unitaries = (step_unitaries or su2_step_unitaries)(np.arange(num_steps - 1) * dt, dt)
+        with stage("exact.cumulative_product"):
+            evolved = cumulative_products(unitaries) @ columns
+        evolved *= np.linalg.norm(columns, axis=0) / np.linalg.norm(evolved, axis=1, keepdims=True)
+        _store(states, slice(1, None), evolved, layout)
+    return states
+
+
+def run_exact_sim(
+    initial_state: np.ndarray,
+    t_span: float,
+    dt: float,
+    engine: str = "expm",
+    hamiltonian: Optional[Callable] = None,
+    sink=None,
+    density_matrix: bool = False,
+) -> np.ndarray:
+    """Run exact simulation over a time grid.
+
+    A batch of initial states, or the square-root factor of a density
+    matrix, is propagated as one (dim, M) block, so every step costs one
+    propagator (or one expm_multiply call) for the whole ensemble.
+
+    Args:
+        initial_state: Starting state vector (dim,), a batch of states
+            (M, dim), or a density matrix (dim, dim) with `density_matrix`.
+        t_span: Final time value.
+        dt: Time step size.
+        engine: Propagation engine, one of `ENGINES`.
+        hamiltonian: Optional callable returning H(t) (dense or sparse) for
+            the "expm", "krylov" and "magnus4" engines.
+        sink: Optional output sink (see `app.sinks`); the trajectory is
+            written into its "exact_states" array step by step.
+        density_matrix: Interpret a square `initial_state` as a density
+            matrix rho and return rho(t) = U rho U^dagger.
+
+    Returns:
+        Array of shape (num_steps, dim), (num_steps, M, dim) or
+        (num_steps, dim, dim) with the full trajectory.
+    """
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown exact engine '{engine}', expected one of {ENGINES}")
+    if engine == "su2" and hamiltonian is not None:
+        raise ValueError("The 'su2' engine only supports the built-in single-qubit Hamiltonian")
+    initial_state = np.asarray(initial_state, dtype=complex)
+    if density_matrix:
+        layout, columns = "density", _density_factor(initial_state)
+    elif initial_state.ndim == 2:
+        layout, columns = "batch", initial_state.T
+    else:
+        layout, columns = "single", initial_state[:, None]
+    num_steps = int(t_span / dt) + 1
+    states = allocate(sink, "exact_states", (num_steps,) + initial_state.shape, complex)
+    if engine == "expm":
+        _run_stepwise(exact_step, states, columns, layout, dt, hamiltonian)
+    elif engine == "krylov":
+        _run_stepwise(krylov_step, states, columns, layout, dt, hamiltonian)
+    elif engine == "magnus4" and hamiltonian is not None:
+        _run_stepwise(magnus4_step, states, columns, layout, dt, hamiltonian)
+    elif engine == "magnus4":
+        _run_su2(states, columns, layout, dt, magnus4_su2_unitaries)
+    else:
+        _run_su2(states, columns, layout, dt)
     return states
 
 
-__all__ = ["exact_step", "run_exact_sim"]
+__all__ = [
+    "exact_step",
+    "krylov_step",
+    "magnus4_generator",
+    "magnus4_step",
+    "magnus4_su2_unitaries",
+    "run_exact_sim",
+    "su2_step_unitaries",
+    "cumulative_products",
+    "ENGINES",
+]
@@ -0,0 +1,266 @@
+"""sinks.py
+Output sinks that receive simulation trajectories step by step.
+
+Simulators ask a sink for named arrays (`allocate`) and write rows into them
+as the run progresses, so long trajectories never need to fit in memory.
+    MemorySink   plain NumPy arrays (the default behaviour)
+    NpySink      one `.npy` file per array, written through `np.memmap`;
+                 `read` maps the file back without copying
+    ChunkedSink  one directory per array holding fixed-size `.npy` chunks,
+                 so files stay small and finished chunks can be shipped or
+                 inspected while the run is still going
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+SINKS = ("memory", "npy", "chunked")
+
+
+class MemorySink:
+    """Keep every array in memory."""
+
+    def __init__(self):
+        self.arrays = {}
+
+    def allocate(self, name: str, shape: tuple, dtype) -> np.ndarray:
+        """Create a zero-filled array registered under `name`."""
+
+        self.arrays[name] = np.zeros(shape, dtype=dtype)
+        return self.arrays[name]
+
+    def read(self, name: str) -> np.ndarray:
+        """Return a previously allocated array."""
+
+        return self.arrays[name]
+
+    def flush(self) -> None:
+        """Nothing to do for in-memory arrays."""
+
+
+class NpySink:
+    """Write each array to `<directory>/<name>.npy` through a memory map."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.arrays = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def allocate(self, name: str, shape: tuple, dtype) -> np.memmap:
+        """Create a writable memory-mapped `.npy` file."""
+
+        self.arrays[name] = np.lib.format.open_memmap(self._path(name), mode="w+", dtype=dtype, shape=shape)
+        return self.arrays[name]
+
+    def read(self, name: str) -> np.memmap:
+        """Map a stored array read-only (zero-copy)."""
+
+        self.flush()
+        return np.load(self._path(name), mmap_mode="r")
+
+    def flush(self) -> None:
+        """Push pending writes of all open memory maps to disk."""
+
+        for array in self.arrays.values():
+            array.flush()
+
+
+class ChunkedArray:
+    """Array-like made of `.npy` chunk files with `chunk_rows` rows each.
+
+    Supports indexing and assignment with integer, slice or integer-array
+    row keys (optionally followed by indices into the trailing axes), `len`,
+    `shape`, `dtype` and conversion with `np.asarray` (which concatenates all
+    chunks). Indexing and assignment touch only the chunks that hold the
+    selected rows, one block per chunk, and iteration walks the array one
+    chunk at a time.
+    """
+
+    def __init__(self, directory: str, shape: tuple, dtype, chunk_rows: int, mode: str = "w+"):
+        self.directory = directory
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.chunk_rows = chunk_rows
+        self.mode = mode
+        self._chunks = {}
+        if mode == "w+":
+            os.makedirs(directory, exist_ok=True)
+            for stale in os.listdir(directory):
+                if stale.startswith("chunk_"):
+                    os.remove(os.path.join(directory, stale))
+            meta = {"shape": list(self.shape), "dtype": self.dtype.str, "chunk_rows": chunk_rows}
+            with open(os.path.join(directory, "meta.json"), "w") as handle:
+                json.dump(meta, handle)
+
+    @classmethod
+    def open(cls, directory: str) -> "ChunkedArray":
+        """Reopen a chunked array written earlier, read-only."""
+
+        with open(os.path.join(directory, "meta.json")) as handle:
+            meta = json.load(handle)
+        return cls(directory, tuple(meta["shape"]), meta["dtype"], meta["chunk_rows"], mode="r")
+
+    @property
+    def num_chunks(self) -> int:
+        return -(-self.shape[0] // self.chunk_rows)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def _chunk(self, index: int) -> np.ndarray:
+        if index not in self._chunks:
+            path = os.path.join(self.directory, f"chunk_{index:06d}.npy")
+            if self.mode == "r":
+                self._chunks[index] = np.load(path, mmap_mode="r")
+            elif os.path.exists(path):
+                # A chunk released earlier in this run: reopen it for updates.
+                self._chunks[index] = np.load(path, mmap_mode="r+")
+            else:
+                rows = min(self.chunk_rows, self.shape[0] - index * self.chunk_rows)
+                self._chunks[index] = np.lib.format.open_memmap(
+                    path, mode="w+", dtype=self.dtype, shape=(rows,) + self.shape[1:]
+                )
+                # Finished chunks are flushed and released as soon as writing moves on.
+                for done in [i for i in self._chunks if i < index - 1]:
+                    self._chunks.pop(done).flush()
+        return self._chunks[index]
+
+    def _row_runs(self, rows) -> tuple:
+        """Map a row key to runs of rows that live in the same chunk.
+
+        Returns:
+            Tuple (num_rows, runs) where each run is (chunk_index, chunk_key,
+            start, stop): rows [start, stop) of the selection sit at
+            `chunk_key` (a slice when contiguous) of that chunk.
+        """
+
+        if isinstance(rows, slice):
+            rows = np.arange(*rows.indices(self.shape[0]))
+        else:
+            rows = np.arange(self.shape[0])[rows]
+        chunk_indices, offsets = np.divmod(rows, self.chunk_rows)
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(chunk_indices)) + 1]).astype(int)
+        stops = np.append(starts[1:], len(rows)).astype(int)
+        runs = []
+        for start, stop in zip(starts, stops):
+            if stop <= start:
+                continue
+            run = offsets[start:stop]
+            contiguous = run[-1] - run[0] == stop - start - 1 and np.all(np.diff(run) == 1)
+            chunk_key = slice(int(run[0]), int(run[-1]) + 1) if contiguous else run
+            runs.append((int(chunk_indices[start]), chunk_key, start, stop))
+        return len(rows), runs
+
+    @staticmethod
+    def _split_key(key) -> tuple:
+        if key is Ellipsis:
+            key = slice(None)
+        return (key[0], key[1:]) if isinstance(key, tuple) else (key, ())
+
+    def __setitem__(self, key, value) -> None:
+        rows, rest = self._split_key(key)
+        if isinstance(rows, (int, np.integer)):
+            chunk_index, offset = divmod(rows % self.shape[0], self.chunk_rows)
+            self._chunk(chunk_index)[(offset,) + rest] = value
+            return
+        num_rows, runs = self._row_runs(rows)
+        # Shape of the selection, taken from a zero-memory broadcast view
+        target = np.broadcast_to(np.empty((), self.dtype), (num_rows,) + self.shape[1:])
+        values = np.broadcast_to(np.asarray(value), target[(slice(None),) + rest].shape)
+        # One block write per chunk
+        for chunk_index, chunk_key, start, stop in runs:
+            self._chunk(chunk_index)[(chunk_key,) + rest] = values[start:stop]
+
+    def __getitem__(self, key):
+        rows, rest = self._split_key(key)
+        if rows is Ellipsis or rows is None:
+            return np.asarray(self)[key]
+        if isinstance(rows, (int, np.integer)):
+            chunk_index, offset = divmod(rows % self.shape[0], self.chunk_rows)
+            value = self._chunk(chunk_index)[(offset,) + rest]
+            return np.array(value) if isinstance(value, np.ndarray) else value
+        num_rows, runs = self._row_runs(rows)
+        parts = [self._chunk(chunk_index)[chunk_key] for chunk_index, chunk_key, _, _ in runs]
+        if not parts:
+            return np.zeros((0,) + self.shape[1:], dtype=self.dtype)[(slice(None),) + rest]
+        return np.concatenate(parts)[(slice(None),) + rest]
+
+    def __iter__(self):
+        for index in range(self.num_chunks):
+            yield from np.array(self._chunk(index))
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        self.flush()
+        parts = [self._chunk(i) for i in range(self.num_chunks)]
+        array = np.concatenate(parts) if parts else np.zeros(self.shape, dtype=self.dtype)
+        return array.astype(dtype) if dtype is not None else array
+
+    def flush(self) -> None:
+        for chunk in self._chunks.values():
+            if isinstance(chunk, np.memmap) and self.mode != "r":
+                chunk.flush()
+
+
+class ChunkedSink:
+    """Write each array to `<directory>/<name>/chunk_*.npy` files."""
+
+    def __init__(self, directory: str, chunk_rows: int = 4096):
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.arrays = {}
+
+    def allocate(self, name: str, shape: tuple, dtype) -> ChunkedArray:
+        """Create a chunked array registered under `name`."""
+
+        path = os.path.join(self.directory, name)
+        self.arrays[name] = ChunkedArray(path, shape, dtype, self.chunk_rows)
+        return self.arrays[name]
+
+    def read(self, name: str) -> ChunkedArray:
+        """Reopen a stored array; chunks are memory-mapped on access."""
+
+        self.flush()
+        return ChunkedArray.open(os.path.join(self.directory, name))
+
+    def flush(self) -> None:
+        for array in self.arrays.values():
+            array.flush()
+
+
+def allocate(sink, name: str, shape: tuple, dtype):
+    """Allocate through `sink`, or return a plain zero array when it is None."""
+
+    if sink is None:
+        return np.zeros(shape, dtype=dtype)
+    return sink.allocate(name, shape, dtype)
+
+
+def make_sink(kind: str = "memory", directory: Optional[str] = None, **options):
+    """Create a sink by name.
+
+    Args:
+        kind: One of `SINKS`.
+        directory: Output directory for the file-backed sinks.
+        **options: Extra keyword arguments (e.g. `chunk_rows`).
+    """
+
+    if kind == "memory":
+        return MemorySink()
+    if kind not in SINKS:
+        raise ValueError(f"Unknown sink '{kind}', expected one of {SINKS}")
+    if directory is None:
+        raise ValueError(f"The '{kind}' sink needs an output directory")
+    if kind == "npy":
+        return NpySink(directory)
+    return ChunkedSink(directory, **options)
+
+
+__all__ = ["MemorySink", "NpySink", "ChunkedSink", "ChunkedArray", "allocate", "make_sink", "SINKS"]
@@ -6,71 +6,427 @@ to the exact reference trajectory.
 
 from __future__ import annotations
 
+import time
+from typing import Any, Callable, Optional
+
 import numpy as np
 
-from .ansatz import ansatz_state, prepare_initial_state
-from .hamiltonian import initial_state
+from . import ansatz as single_qubit_ansatz
+from . import metrics
+from .checkpoint import load_checkpoint, save_checkpoint
+from .profiling import stage
+from .hamiltonian import hamiltonian_matrix, initial_state
 from .simulator_exact import run_exact_sim
-from .vqs_core import vqs_update
+from .shots import ShotEstimator, shot_solve_step
+from .sinks import allocate
+from .trotter import TrotterCircuit, run_trotter_sim
+from .vqs_core import (
+    FIXED_STEP_INTEGRATORS,
+    _check_integrator,
+    _check_mode,
+    dormand_prince_interval,
+    energy_from_context,
+    solve_step,
+    step_context,
+    theta_dot,
+)
 
 
 def fidelity(psi: np.ndarray, phi: np.ndarray) -> float:
     """Compute fidelity between two pure states."""
 
-    return float(np.abs(np.vdot(psi, phi)) ** 2)
+    return float(metrics.fidelity(psi, phi))
 
 
-def run_vqs(initial_params: np.ndarray, t_span: float, dt: float) -> tuple:
+def run_vqs(
+    initial_params: np.ndarray,
+    t_span: float,
+    dt: float,
+    ansatz: Any = None,
+    hamiltonian: Optional[Callable] = None,
+    integrator: str = "euler",
+    rtol: float = 1e-6,
+    atol: float = 1e-8,
+    solver: Any = None,
+    return_diagnostics: bool = False,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = 100,
+    sink=None,
+    shots: Any = None,
+    mode: str = "real",
+    energy_tol: Optional[float] = None,
+    hamiltonian_time: float = 0.0,
+) -> tuple:
     """Run the variational simulation.
 
     Args:
         initial_params: Starting parameter vector.
         t_span: Final time value.
-        dt: Time step size.
+        dt: Time step size (spacing of the output grid).
+        ansatz: Optional ansatz object; defaults to the single-qubit ansatz.
+        hamiltonian: Optional H(t) callable; defaults to the single-qubit model.
+        integrator: One of "euler", "rk4" or "rk45". The adaptive "rk45"
+            takes as many error-controlled substeps per grid interval as the
+            tolerances require.
+        rtol: Relative tolerance for "rk45".
+        atol: Absolute tolerance for "rk45".
+        solver: Linear solver strategy for A theta_dot = C: None, a name
+            from `vqs_core.SOLVERS` or a `LinearSolver`.
+        return_diagnostics: Also return a dict with the accepted step end
+            times ("step_times"), the number of theta_dot evaluations
+            ("rhs_evaluations"), the condition number of A at every grid
+            step ("condition_numbers"), the energy <H> at every grid point
+            ("energies") and whether `energy_tol` stopped the run
+            ("converged").
+        checkpoint_path: If given, the loop state is saved there every
+            `checkpoint_every` steps and at the end, and the history rows
+            filled since the last save are appended to `.npy` files next to
+            it (see `app.checkpoint`); see `resume_vqs`.
+        checkpoint_every: Steps between checkpoints.
+        sink: Optional output sink (see `app.sinks`) that receives the
+            "param_history" and "variational_states" arrays step by step.
+        shots: Estimate A and C from simulated measurements instead of exact
+            overlaps: a shot budget per theta_dot evaluation or a
+            `ShotEstimator`. The diagnostics then also hold the standard
+            error of theta_dot at every grid step ("theta_dot_std").
+        mode: "real" for Schrödinger dynamics or "imaginary" for
+            imaginary-time evolution towards the ground state, in which case
+            `t_span` and `dt` are imaginary times.
+        energy_tol: Stop early once <H> changes by less than this between
+            two grid points; the returned histories then end at that point.
+        hamiltonian_time: Physical time at which H is frozen in imaginary
+            mode; every step, integrator stage and energy uses H at this
+            time. Ignored in real mode.
 
     Returns:
-        Tuple of (state_history, param_history) arrays.
+        Tuple of (state_history, param_history) arrays, plus the diagnostics
+        dict when requested.
     """
 
+    _check_integrator(integrator)
+    _check_mode(mode)
+    ansatz = ansatz or single_qubit_ansatz
     num_steps = int(t_span / dt) + 1
-    param_history = np.zeros((num_steps, len(initial_params)), dtype=float)
-    state_history = np.zeros((num_steps, 2), dtype=complex)
-
     params = initial_params.copy()
+    state0 = np.asarray(ansatz.ansatz_state(params))
+    param_history = allocate(sink, "param_history", (num_steps, len(initial_params)), float)
+    state_history = allocate(sink, "variational_states", (num_steps, state0.shape[0]), complex)
     param_history[0] = params
-    state_history[0] = ansatz_state(params)
+    state_history[0] = state0
+    progress = {
+        "next_step": 1,
+        "params": params,
+        "param_history": param_history,
+        "state_history": state_history,
+        "step_times": [],
+        "condition_numbers": np.zeros(num_steps - 1),
+        "energies": np.zeros(num_steps),
+        "rhs_evaluations": 0,
+        "trial_step": None,
+        "converged": False,
+    }
+    if shots is not None:
+        progress["theta_dot_std"] = np.zeros((num_steps - 1, len(initial_params)))
+    settings = {
+        "t_span": t_span,
+        "dt": dt,
+        "integrator": integrator,
+        "rtol": rtol,
+        "atol": atol,
+        "mode": mode,
+        "energy_tol": energy_tol,
+        "hamiltonian_time": hamiltonian_time,
+    }
+    return _continue_vqs(
+        progress,
+        settings,
+        ansatz,
+        hamiltonian,
+        solver,
+        return_diagnostics,
+        checkpoint_path,
+        checkpoint_every,
+        _as_estimator(shots),
+    )
+
+
+def _as_estimator(shots: Any) -> Optional[ShotEstimator]:
+    """Accept None, a shot budget per step or a ShotEstimator."""
+
+    if shots is None or isinstance(shots, ShotEstimator):
+        return shots
+    return ShotEstimator(shots_per_step=int(shots))
+
+
+def resume_vqs(
+    checkpoint_path: str,
+    ansatz: Any = None,
+    hamiltonian: Optional[Callable] = None,
+    solver: Any = None,
+    return_diagnostics: bool = False,
+    checkpoint_every: int = 100,
+    sink=None,
+    shots: Any = None,
+) -> tuple:
+    """Continue a `run_vqs` call from its last checkpoint.
+
+    The time grid, integrator, tolerances, mode, energy_tol and
+    hamiltonian_time are restored from the file; the ansatz, Hamiltonian,
+    solver and shot settings cannot be serialized and must be passed again
+    exactly as in the original call; the state of the shot estimator's
+    random generator comes from the checkpoint. The continued run is bit-for-bit identical to an
+    uninterrupted one and keeps checkpointing to the same path. If a `sink`
+    is given, the restored histories are copied into it.
+
+    Returns:
+        Same as `run_vqs`.
+    """
+
+    progress, settings = load_checkpoint(checkpoint_path)
+    if sink is not None:
+        for key, name in (("param_history", "param_history"), ("state_history", "variational_states")):
+            restored = progress[key]
+            progress[key] = sink.allocate(name, restored.shape, restored.dtype)
+            progress[key][:] = restored
+    return _continue_vqs(
+        progress,
+        settings,
+        ansatz or single_qubit_ansatz,
+        hamiltonian,
+        solver,
+        return_diagnostics,
+        checkpoint_path,
+        checkpoint_every,
+        _as_estimator(shots),
+    )
+
+
+def _continue_vqs(
+    progress: dict,
+    settings: dict,
+    ansatz: Any,
+    hamiltonian: Optional[Callable],
+    solver: Any,
+    return_diagnostics: bool,
+    checkpoint_path: Optional[str],
+    checkpoint_every: int,
+    estimator: Optional[ShotEstimator] = None,
+) -> tuple:
+    """Run the VQS loop from `progress["next_step"]` to the end of the grid."""
+
+    dt = settings["dt"]
+    integrator = settings["integrator"]
+    mode = settings["mode"]
+    energy_tol = settings["energy_tol"]
+    param_history = progress["param_history"]
+    state_history = progress["state_history"]
+    condition_numbers = progress["condition_numbers"]
+    energies = progress["energies"]
+    num_steps = param_history.shape[0]
+    params = progress["params"]
+    if estimator is not None and progress.get("rng_state") is not None:
+        estimator.rng.bit_generator.state = progress["rng_state"]
 
-    for k in range(1, num_steps):
+    def physical_time(s: float) -> float:
+        # Imaginary time runs against a fixed H; the grid time is not physical
+        return settings["hamiltonian_time"] if mode == "imaginary" else s
+
+    def rhs(p: np.ndarray, s: float) -> np.ndarray:
+        progress["rhs_evaluations"] += 1
+        if estimator is not None:
+            ctx = step_context(p, physical_time(s), ansatz, hamiltonian)
+            return shot_solve_step(ctx, estimator, hamiltonian, solver, mode)[0]
+        return theta_dot(p, physical_time(s), ansatz, hamiltonian, solver, mode)
+
+    for k in range(progress["next_step"], num_steps):
         t = (k - 1) * dt
-        params = vqs_update(params, t, dt)
-        param_history[k] = params
-        state_history[k] = ansatz_state(params)
+        # One context per step: its state fills the history slot for `params`
+        # and its derivatives give the first integrator stage.
+        ctx = step_context(params, physical_time(t), ansatz, hamiltonian)
+        with stage("history.write"):
+            state_history[k - 1] = ctx.state
+            energies[k - 1] = energy_from_context(ctx)
+        if energy_tol is not None and k >= 2 and abs(energies[k - 1] - energies[k - 2]) < energy_tol:
+            _truncate(progress, k)
+            progress["converged"] = True
+            if checkpoint_path:
+                with stage("checkpoint.save"):
+                    save_checkpoint(checkpoint_path, progress, settings)
+            break
+        if estimator is None:
+            k1, condition_numbers[k - 1] = solve_step(ctx, solver, mode)
+        else:
+            k1, condition_numbers[k - 1], progress["theta_dot_std"][k - 1] = shot_solve_step(
+                ctx, estimator, hamiltonian, solver, mode
+            )
+        progress["rhs_evaluations"] += 1
+        if integrator == "rk45":
+            params, accepted, progress["trial_step"] = dormand_prince_interval(
+                rhs,
+                params,
+                t,
+                dt,
+                k1=k1,
+                h=progress["trial_step"],
+                rtol=settings["rtol"],
+                atol=settings["atol"],
+            )
+            progress["step_times"].extend(accepted)
+        else:
+            params = FIXED_STEP_INTEGRATORS[integrator](rhs, params, t, dt, k1=k1)
+            progress["step_times"].append(t + dt)
+        with stage("history.write"):
+            param_history[k] = params
+        progress["params"] = params
+        progress["next_step"] = k + 1
+        if estimator is not None:
+            progress["rng_state"] = estimator.rng.bit_generator.state
+        if checkpoint_path and (k % checkpoint_every == 0 or k == num_steps - 1):
+            with stage("checkpoint.save"):
+                save_checkpoint(checkpoint_path, progress, settings)
+    if num_steps > 1 and not progress["converged"]:
+        last = num_steps - 1
+        state_history[last] = ansatz.ansatz_state(params)
+        H = (hamiltonian or hamiltonian_matrix)(physical_time(last * dt))
+        energies[last] = np.real(np.vdot(state_history[last], H @ state_history[last]))
+
+    if return_diagnostics:
+        diagnostics = {
+            "step_times": np.array(progress["step_times"]),
+            "rhs_evaluations": progress["rhs_evaluations"],
+            "condition_numbers": progress["condition_numbers"],
+            "energies": progress["energies"],
+            "converged": progress["converged"],
+        }
+        if progress.get("theta_dot_std") is not None:
+            diagnostics["theta_dot_std"] = progress["theta_dot_std"]
+        return progress["state_history"], progress["param_history"], diagnostics
+    return progress["state_history"], progress["param_history"]
+
+
+def _truncate(progress: dict, length: int) -> None:
+    """Cut the histories of `progress` down to the first `length` grid points."""
 
-    return state_history, param_history
+    for key in ("param_history", "state_history", "energies"):
+        progress[key] = progress[key][:length]
+    for key in ("condition_numbers", "theta_dot_std"):
+        if progress.get(key) is not None:
+            progress[key] = progress[key][: length - 1]
+    progress["params"] = progress["param_history"][-1]
+    progress["next_step"] = length
 
 
-def run_full_simulation(t_span: float = 5.0, dt: float = 0.05):
-    """Execute variational and exact simulations and compare trajectories."""
+# Rows per fidelity block for sinks without a chunk size of their own
+_FIDELITY_BLOCK_ROWS = 4096
+
+
+def _fill_fidelities(out, psi, phi, sink=None) -> None:
+    """Write metrics.fidelity(psi, phi) into `out`.
+
+    Sink-backed trajectories are compared in row blocks (the sink's chunk
+    size when it has one), so no full (T, dim) temporary is built.
+    """
 
-    params0 = prepare_initial_state()
-    exact_init = initial_state()
+    block_rows = len(out) if sink is None else getattr(sink, "chunk_rows", _FIDELITY_BLOCK_ROWS)
+    for start in range(0, len(out), max(block_rows, 1)):
+        stop = start + block_rows
+        out[start:stop] = metrics.fidelity(psi[start:stop], phi[start:stop])
 
-    var_states, param_hist = run_vqs(params0, t_span, dt)
-    exact_states = run_exact_sim(exact_init, t_span, dt)
 
-    fidelities = []
-    for psi_var, psi_exact in zip(var_states, exact_states):
-        fidelities.append(fidelity(psi_var, psi_exact))
-    fidelities = np.array(fidelities)
+def run_full_simulation(
+    t_span: float = 5.0,
+    dt: float = 0.05,
+    ansatz: Any = None,
+    hamiltonian: Optional[Callable] = None,
+    exact_engine: str = "expm",
+    integrator: str = "euler",
+    solver: Any = None,
+    initial_params: Optional[np.ndarray] = None,
+    sink=None,
+    shots: Any = None,
+    trotter_order: Optional[int] = None,
+):
+    """Execute variational and exact simulations and compare trajectories.
+
+    With a custom `ansatz` or `initial_params` the exact reference starts from
+    the ansatz state at the initial parameters, so both trajectories share
+    the same origin. Otherwise it starts from |0>. With a `sink`, states,
+    parameters, fidelities and times are all streamed into it. `shots`
+    switches the variational run to finite-shot estimation (see `run_vqs`).
+
+    With `trotter_order` (1 or 2) a Trotterized circuit runs on the same grid
+    as a third engine; its states, fidelities against the exact reference
+    and per-step gate counts are added to the results. "wall_times" holds
+    the seconds spent in each engine.
+    """
+
+    if ansatz is None and initial_params is None:
+        params0 = single_qubit_ansatz.prepare_initial_state()
+        exact_init = initial_state()
+    else:
+        source = ansatz or single_qubit_ansatz
+        if initial_params is None:
+            params0 = source.prepare_initial_state()
+        else:
+            params0 = np.asarray(initial_params, dtype=float)
+        exact_init = np.asarray(source.ansatz_state(params0), dtype=complex)
+
+    wall_times = {}
+    start = time.perf_counter()
+    var_states, param_hist, diagnostics = run_vqs(
+        params0,
+        t_span,
+        dt,
+        ansatz,
+        hamiltonian,
+        integrator=integrator,
+        solver=solver,
+        return_diagnostics=True,
+        sink=sink,
+        shots=shots,
+    )
+    wall_times["vqs"] = time.perf_counter() - start
+    start = time.perf_counter()
+    exact_states = run_exact_sim(
+        exact_init, t_span, dt, engine=exact_engine, hamiltonian=hamiltonian, sink=sink
+    )
+    wall_times["exact"] = time.perf_counter() - start
+
+    num_steps = int(t_span / dt) + 1
+    fidelities = allocate(sink, "fidelities", (num_steps,), float)
+    with stage("metrics.fidelity"):
+        _fill_fidelities(fidelities, var_states, exact_states, sink)
+
+    trotter = {}
+    if trotter_order is not None:
+        start = time.perf_counter()
+        trotter_states = run_trotter_sim(exact_init, t_span, dt, hamiltonian, trotter_order, sink)
+        wall_times["trotter"] = time.perf_counter() - start
+        trotter_fidelities = allocate(sink, "trotter_fidelities", (num_steps,), float)
+        with stage("metrics.fidelity"):
+            _fill_fidelities(trotter_fidelities, trotter_states, exact_states, sink)
+        circuit = TrotterCircuit(hamiltonian, trotter_order)
+        trotter = {
+            "trotter_states": trotter_states,
+            "trotter_fidelities": trotter_fidelities,
+            "trotter_rotations_per_step": circuit.rotations_per_step,
+            "trotter_cnots_per_step": circuit.cnots_per_step,
+        }
 
-    times = np.linspace(0.0, t_span, int(t_span / dt) + 1)
+    times = allocate(sink, "times", (num_steps,), float)
+    times[:] = np.linspace(0.0, t_span, num_steps)
+    if sink is not None:
+        sink.flush()
     return {
         "times": times,
         "variational_states": var_states,
         "exact_states": exact_states,
         "fidelities": fidelities,
         "param_history": param_hist,
+        "wall_times": wall_times,
+        **trotter,
+        **diagnostics,
     }
 
 
-__all__ = ["run_full_simulation", "run_vqs", "fidelity"]
+__all__ = ["run_full_simulation", "run_vqs", "resume_vqs", "fidelity"]
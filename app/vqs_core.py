@@ -6,77 +6,507 @@ close as possible to the exact Schrödinger evolution.
 Mathematically, we solve A(t) * theta_dot = C(t) where
     A_ij = Re(<dpsi_i | dpsi_j>)
     C_i  = Im(<dpsi_i | H | psi>)
-The update step is explicit Euler for simplicity.
+In imaginary-time mode (ground-state preparation) the right-hand side is
+    C_i  = -Re(<dpsi_i | (H - E) | psi>),   E = <psi | H | psi>
+so the parameters follow the normalized flow d|psi>/dtau = -(H - E)|psi>.
+The resulting ODE theta_dot = A^{-1} C is integrated with explicit Euler by
+default; RK4 and an adaptive Dormand-Prince RK45 are available as well.
+How A is inverted is controlled by a `LinearSolver` (plain solve with a
+small shift, Tikhonov, truncated pseudo-inverse or adaptive epsilon).
+
+Both A and C depend on the same state and derivative vectors, so a
+`StepContext` evaluates them once per step and the builders below reuse it.
+
+By default the single-qubit ansatz and Hamiltonian are used. Any object with
+`ansatz_state` / `derivative_states` methods (e.g. `HardwareEfficientAnsatz`)
+and any `hamiltonian(t)` callable returning a dense or sparse matrix (e.g.
+`TimeDependentPauliHamiltonian`) can be passed instead.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
 import numpy as np
-import pennylane as qml
 
-from .ansatz import ansatz_state, derivative_states
-from .hamiltonian import H_of_t
+from . import ansatz as single_qubit_ansatz
+from .hamiltonian import hamiltonian_matrix
+from .profiling import stage
 
 
-def compute_A_matrix(params: np.ndarray) -> np.ndarray:
-    """Compute the quantum geometric tensor matrix A.
+@dataclass(frozen=True)
+class StepContext:
+    """Quantities shared by every McLachlan step at fixed (params, t).
+
+    Attributes:
+        params: Parameter vector the context was evaluated at.
+        t: Time value.
+        state: Ansatz statevector |psi(params)>.
+        derivs: Array with shape (num_params, state_dim) holding d|psi>/dθ_i.
+        H: Matrix representation of H(t) (dense or sparse).
+    """
+
+    params: np.ndarray
+    t: float
+    state: np.ndarray
+    derivs: np.ndarray
+    H: Any
+
+
+def step_context(
+    params: np.ndarray, t: float, ansatz: Any = None, hamiltonian: Optional[Callable] = None
+) -> StepContext:
+    """Evaluate the state, its Jacobian and H(t) once for a VQS step.
 
     Args:
         params: Current parameter vector.
+        t: Current time.
+        ansatz: Object providing `ansatz_state` and `derivative_states`;
+            defaults to the single-qubit ansatz module.
+        hamiltonian: Callable returning H(t); defaults to the single-qubit
+            Hamiltonian.
 
     Returns:
-        Real-valued matrix with shape (p, p).
+        StepContext that can be passed to the A and C builders.
     """
 
-    derivs = derivative_states(params)
-    num_params = derivs.shape[0]
-    A = np.zeros((num_params, num_params), dtype=float)
-    for i in range(num_params):
-        for j in range(num_params):
-            overlap = np.vdot(derivs[i], derivs[j])
-            A[i, j] = np.real(overlap)
+    ansatz = ansatz or single_qubit_ansatz
+    hamiltonian = hamiltonian or hamiltonian_matrix
+    with stage("ansatz.state"):
+        state = np.asarray(ansatz.ansatz_state(params))
+    with stage("ansatz.jacobian"):
+        derivs = ansatz.derivative_states(params)
+    with stage("hamiltonian.matrix"):
+        H = hamiltonian(t)
+    return StepContext(params=params, t=t, state=state, derivs=derivs, H=H)
+
+
+MODES = ("real", "imaginary")
+
+
+def _check_mode(mode: str) -> None:
+    if mode not in MODES:
+        raise ValueError(f"Unknown VQS mode '{mode}', expected one of {MODES}")
+
+
+def energy_from_context(ctx: StepContext) -> float:
+    """Return the energy <psi|H(t)|psi> of the context state."""
+
+    return float(np.real(np.vdot(ctx.state, ctx.H @ ctx.state)))
+
+
+def A_from_derivatives(derivs: np.ndarray, shift: float = 1e-6) -> np.ndarray:
+    """Return A_ij = Re(<dpsi_i | dpsi_j>) plus a small diagonal shift.
+
+    Computed as one matrix product Re(D^* D^T) on the stacked derivatives.
+
+    Args:
+        derivs: Array with shape (..., num_params, state_dim); leading axes
+            are treated as a batch of independent parameter sets.
+        shift: Diagonal shift added to A.
+
+    Returns:
+        Real array with shape (..., num_params, num_params).
+    """
+
+    derivs = np.asarray(derivs)
+    A = np.real(np.conj(derivs) @ np.swapaxes(derivs, -1, -2))
     # Add tiny diagonal shift to avoid singular matrices in early steps
-    A += 1e-6 * np.eye(num_params)
+    A += shift * np.eye(derivs.shape[-2])
     return A
 
 
-def compute_C_vector(params: np.ndarray, t: float) -> np.ndarray:
+def C_from_derivatives(derivs: np.ndarray, h_psi: np.ndarray) -> np.ndarray:
+    """Return C_i = Im(<dpsi_i | H psi>) as one matrix-vector product.
+
+    Args:
+        derivs: Array with shape (..., num_params, state_dim).
+        h_psi: H|psi> with shape (..., state_dim), batched like `derivs`.
+
+    Returns:
+        Real array with shape (..., num_params).
+    """
+
+    h_psi = np.asarray(h_psi)
+    return np.imag(np.conj(derivs) @ h_psi[..., None])[..., 0]
+
+
+def C_imaginary_from_derivatives(derivs: np.ndarray, h_psi: np.ndarray, state: np.ndarray) -> np.ndarray:
+    """Return C_i = -Re(<dpsi_i | (H - E) psi>) for imaginary-time evolution.
+
+    Args:
+        derivs: Array with shape (..., num_params, state_dim).
+        h_psi: H|psi> with shape (..., state_dim).
+        state: |psi> with shape (..., state_dim).
+
+    Returns:
+        Real array with shape (..., num_params).
+    """
+
+    h_psi, state = np.asarray(h_psi), np.asarray(state)
+    energy = np.real(np.sum(np.conj(state) * h_psi, axis=-1))
+    projected = h_psi - energy[..., None] * state
+    return -np.real(np.conj(derivs) @ projected[..., None])[..., 0]
+
+
+def A_from_context(ctx: StepContext) -> np.ndarray:
+    """Build the A matrix from an already evaluated step context."""
+
+    return A_from_derivatives(ctx.derivs)
+
+
+def C_from_context(ctx: StepContext, mode: str = "real") -> np.ndarray:
+    """Build the C vector from an already evaluated step context.
+
+    Args:
+        ctx: Evaluated step context.
+        mode: "real" or "imaginary" time (see `MODES`).
+    """
+
+    _check_mode(mode)
+    if mode == "imaginary":
+        return C_imaginary_from_derivatives(ctx.derivs, ctx.H @ ctx.state, ctx.state)
+    return C_from_derivatives(ctx.derivs, ctx.H @ ctx.state)
+
+
+def compute_A_matrix(params: np.ndarray, ansatz: Any = None) -> np.ndarray:
+    """Compute the quantum geometric tensor matrix A.
+
+    Args:
+        params: Current parameter vector.
+        ansatz: Optional ansatz object (see `step_context`).
+
+    Returns:
+        Real-valued matrix with shape (p, p).
+    """
+
+    return A_from_derivatives((ansatz or single_qubit_ansatz).derivative_states(params))
+
+
+def compute_C_vector(
+    params: np.ndarray,
+    t: float,
+    ansatz: Any = None,
+    hamiltonian: Optional[Callable] = None,
+    mode: str = "real",
+) -> np.ndarray:
     """Compute the right-hand side vector C for the VQS equation.
 
+    If the ansatz offers `adjoint_jacobian`, C is obtained from a single
+    adjoint sweep with bra H|psi> (or (H - E)|psi>), without building the
+    derivative states.
+
     Args:
         params: Current parameter vector.
         t: Current time.
+        ansatz: Optional ansatz object (see `step_context`).
+        hamiltonian: Optional H(t) callable (see `step_context`).
+        mode: "real" or "imaginary" time (see `MODES`).
 
     Returns:
         Real vector with length equal to number of parameters.
     """
 
-    psi = ansatz_state(params)
-    derivs = derivative_states(params)
-    H = qml.matrix(H_of_t(t))()
-    C = []
-    for dpsi in derivs:
-        element = np.vdot(dpsi, H @ psi)
-        C.append(np.imag(element))
-    return np.array(C, dtype=float)
+    _check_mode(mode)
+    adjoint_jacobian = getattr(ansatz, "adjoint_jacobian", None)
+    if adjoint_jacobian is None:
+        return C_from_context(step_context(params, t, ansatz, hamiltonian), mode)
+    state = np.asarray(ansatz.ansatz_state(params))
+    h_psi = (hamiltonian or hamiltonian_matrix)(t) @ state
+    if mode == "imaginary":
+        projected = h_psi - np.real(np.vdot(state, h_psi)) * state
+        # C_i = -Re(<dpsi_i|(H - E) psi>) = -Re(<(H - E) psi|dpsi_i>)
+        return -np.real(adjoint_jacobian(params, projected))
+    # C_i = Im(<dpsi_i|H psi>) = -Im(<H psi|dpsi_i>)
+    return -np.imag(adjoint_jacobian(params, h_psi))
+
+
+SOLVERS = ("solve", "tikhonov", "pinv", "adaptive")
+
+
+@dataclass(frozen=True)
+class LinearSolver:
+    """Strategy for solving A theta_dot = C.
+
+    All methods work on the eigen-decomposition A = V diag(λ) V^T of the
+    symmetric matrix A (without the default shift):
+        "solve"     np.linalg.solve on A + regularization * I
+        "tikhonov"  filter factors λ / (λ^2 + regularization^2)
+        "pinv"      pseudo-inverse dropping λ < rcond * max(λ)
+        "adaptive"  Tikhonov with epsilon = max(λ) / max_condition, applied
+                    only when cond(A) exceeds max_condition
+
+    Attributes:
+        method: One of `SOLVERS`.
+        regularization: Shift ("solve") or Tikhonov epsilon ("tikhonov").
+        rcond: Relative cutoff for "pinv".
+        max_condition: Largest condition number "adaptive" accepts unchanged.
+    """
+
+    method: str = "solve"
+    regularization: float = 1e-6
+    rcond: float = 1e-10
+    max_condition: float = 1e6
+
+    def __post_init__(self):
+        if self.method not in SOLVERS:
+            raise ValueError(f"Unknown solver '{self.method}', expected one of {SOLVERS}")
+
+    def solve(self, A: np.ndarray, C: np.ndarray) -> tuple:
+        """Return (theta_dot, condition_number_of_A).
 
+        C may also be a (P, K) matrix of right-hand sides; all columns are
+        solved with the same decomposition of A.
+        """
 
-def vqs_update(params: np.ndarray, t: float, dt: float) -> np.ndarray:
-    """Perform one Euler update for the parameter vector using McLachlan's rule.
+        eigvals, eigvecs = np.linalg.eigh(A)
+        magnitudes = np.abs(eigvals)
+        largest, smallest = magnitudes.max(), magnitudes.min()
+        condition = np.inf if smallest == 0.0 else float(largest / smallest)
+
+        if self.method == "solve":
+            return np.linalg.solve(A + self.regularization * np.eye(A.shape[0]), C), condition
+        if self.method == "pinv":
+            keep = magnitudes > self.rcond * largest
+            filters = np.divide(1.0, eigvals, out=np.zeros_like(eigvals), where=keep)
+        else:
+            if self.method == "tikhonov":
+                epsilon = self.regularization
+            else:
+                epsilon = largest / self.max_condition if condition > self.max_condition else 0.0
+            denominator = eigvals**2 + epsilon**2
+            filters = np.divide(eigvals, denominator, out=np.zeros_like(eigvals), where=denominator > 0)
+        filters = filters.reshape(filters.shape + (1,) * (np.ndim(C) - 1))
+        return eigvecs @ (filters * (eigvecs.T @ C)), condition
+
+
+def _as_solver(solver: Any) -> LinearSolver:
+    """Accept None, a method name or a LinearSolver instance."""
+
+    if solver is None:
+        return LinearSolver()
+    if isinstance(solver, str):
+        return LinearSolver(method=solver)
+    return solver
+
+
+def solve_step(ctx: StepContext, solver: Any = None, mode: str = "real") -> tuple:
+    """Solve the McLachlan system for a step context.
 
     Args:
+        ctx: Evaluated step context.
+        solver: None (plain solve with the default shift), a name from
+            `SOLVERS` or a `LinearSolver`.
+        mode: "real" or "imaginary" time (see `MODES`).
+
+    Returns:
+        Tuple (theta_dot, condition number of the unshifted A).
+    """
+
+    with stage("vqs.build_A_C"):
+        A = A_from_derivatives(ctx.derivs, shift=0.0)
+        C = C_from_context(ctx, mode)
+    with stage("vqs.solve"):
+        return _as_solver(solver).solve(A, C)
+
+
+def theta_dot_from_context(ctx: StepContext, solver: Any = None, mode: str = "real") -> np.ndarray:
+    """Solve A theta_dot = C for an already evaluated step context."""
+
+    return solve_step(ctx, solver, mode)[0]
+
+
+def theta_dot(
+    params: np.ndarray,
+    t: float,
+    ansatz: Any = None,
+    hamiltonian: Optional[Callable] = None,
+    solver: Any = None,
+    mode: str = "real",
+) -> np.ndarray:
+    """Right-hand side of the McLachlan parameter ODE at (params, t)."""
+
+    return theta_dot_from_context(step_context(params, t, ansatz, hamiltonian), solver, mode)
+
+
+def euler_step(
+    rhs: Callable, params: np.ndarray, t: float, dt: float, k1: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Explicit Euler step for d(params)/dt = rhs(params, t).
+
+    Args:
+        rhs: Callable returning theta_dot.
         params: Current parameters.
         t: Current time.
         dt: Time step.
+        k1: Optional rhs(params, t) if the caller already evaluated it.
+
+    Returns:
+        Updated parameters.
+    """
+
+    k1 = rhs(params, t) if k1 is None else k1
+    return params + dt * k1
+
+
+def rk4_step(
+    rhs: Callable, params: np.ndarray, t: float, dt: float, k1: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Classical fourth-order Runge-Kutta step (same arguments as `euler_step`)."""
+
+    k1 = rhs(params, t) if k1 is None else k1
+    k2 = rhs(params + 0.5 * dt * k1, t + 0.5 * dt)
+    k3 = rhs(params + 0.5 * dt * k2, t + 0.5 * dt)
+    k4 = rhs(params + dt * k3, t + dt)
+    return params + dt / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+
+
+# Dormand-Prince 5(4) Butcher tableau
+_DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+_DP_B5 = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0])
+_DP_B4 = np.array([5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+def dormand_prince_step(rhs: Callable, params: np.ndarray, t: float, h: float, k1: np.ndarray) -> tuple:
+    """One embedded RK45 trial step.
+
+    Returns:
+        Tuple (new_params, error_estimate, k_last), where k_last is the rhs at
+        the new point and can be reused as k1 of the next step (FSAL).
+    """
+
+    stages = [k1]
+    for c, row in zip(_DP_C[1:], _DP_A[1:]):
+        increment = sum(a * k for a, k in zip(row, stages))
+        stages.append(rhs(params + h * increment, t + c * h))
+    stages = np.array(stages)
+    new_params = params + h * (_DP_B5 @ stages)
+    error = h * ((_DP_B5 - _DP_B4) @ stages)
+    return new_params, error, stages[-1]
+
+
+def dormand_prince_interval(
+    rhs: Callable,
+    params: np.ndarray,
+    t: float,
+    dt: float,
+    k1: Optional[np.ndarray] = None,
+    h: Optional[float] = None,
+    rtol: float = 1e-6,
+    atol: float = 1e-8,
+) -> tuple:
+    """Integrate from t to t + dt with error-controlled RK45 substeps.
+
+    Args:
+        rhs: Callable returning theta_dot.
+        params: Parameters at time t.
+        t: Start of the interval.
+        dt: Interval length (the output grid spacing).
+        k1: Optional rhs(params, t) if the caller already evaluated it.
+        h: Initial trial step; defaults to dt.
+        rtol: Relative tolerance of the local error test.
+        atol: Absolute tolerance of the local error test.
+
+    Returns:
+        Tuple (params_at_t_plus_dt, accepted_step_end_times, next_trial_step).
+    """
+
+    t_end = t + dt
+    h = dt if h is None else h
+    k1 = rhs(params, t) if k1 is None else k1
+    accepted_times = []
+    while t_end - t > 1e-12 * max(1.0, abs(t_end)):
+        step = min(h, t_end - t)
+        trial, error, k_last = dormand_prince_step(rhs, params, t, step, k1)
+        scale = atol + rtol * np.maximum(np.abs(params), np.abs(trial))
+        err_norm = float(np.sqrt(np.mean((error / scale) ** 2)))
+        if err_norm <= 1.0:
+            t += step
+            params, k1 = trial, k_last
+            accepted_times.append(t)
+        # Standard step-size controller with safety factor and growth limits
+        factor = 5.0 if err_norm == 0.0 else min(5.0, max(0.2, 0.9 * err_norm ** -0.2))
+        h = step * factor
+    return params, accepted_times, h
+
+
+FIXED_STEP_INTEGRATORS = {"euler": euler_step, "rk4": rk4_step}
+INTEGRATORS = ("euler", "rk4", "rk45")
+
+
+def _check_integrator(integrator: str) -> None:
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator '{integrator}', expected one of {INTEGRATORS}")
+
+
+def vqs_update(
+    params: np.ndarray,
+    t: float,
+    dt: float,
+    ansatz: Any = None,
+    hamiltonian: Optional[Callable] = None,
+    integrator: str = "euler",
+    solver: Any = None,
+    mode: str = "real",
+) -> np.ndarray:
+    """Advance the parameter vector by dt using McLachlan's rule.
+
+    Args:
+        params: Current parameters.
+        t: Current time.
+        dt: Time step.
+        ansatz: Optional ansatz object (see `step_context`).
+        hamiltonian: Optional H(t) callable (see `step_context`).
+        integrator: One of `INTEGRATORS`; "rk45" takes adaptive substeps
+            inside [t, t + dt].
+        solver: Linear solver strategy (see `solve_step`).
+        mode: "real" or "imaginary" time (see `MODES`).
 
     Returns:
         Updated parameters after one step.
     """
 
-    A = compute_A_matrix(params)
-    C = compute_C_vector(params, t)
-    theta_dot = np.linalg.solve(A, C)
-    return params + dt * theta_dot
+    _check_integrator(integrator)
+
+    def rhs(p: np.ndarray, s: float) -> np.ndarray:
+        return theta_dot(p, s, ansatz, hamiltonian, solver, mode)
+
+    if integrator == "rk45":
+        return dormand_prince_interval(rhs, params, t, dt)[0]
+    return FIXED_STEP_INTEGRATORS[integrator](rhs, params, t, dt)
 
 
-__all__ = ["compute_A_matrix", "compute_C_vector", "vqs_update"]
+__all__ = [
+    "StepContext",
+    "step_context",
+    "A_from_context",
+    "C_from_context",
+    "A_from_derivatives",
+    "C_from_derivatives",
+    "C_imaginary_from_derivatives",
+    "energy_from_context",
+    "MODES",
+    "compute_A_matrix",
+    "compute_C_vector",
+    "LinearSolver",
+    "SOLVERS",
+    "solve_step",
+    "theta_dot",
+    "theta_dot_from_context",
+    "euler_step",
+    "rk4_step",
+    "dormand_prince_step",
+    "dormand_prince_interval",
+    "INTEGRATORS",
+    "vqs_update",
+]
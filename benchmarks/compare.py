@@ -0,0 +1,66 @@
+"""compare.py
+Compare two JSON reports written by `python -m app.bench`.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json [--threshold 0.1]
+
+Cases are matched on every key that describes the configuration (case,
+ansatz, engine, qubits, dt, ...). For each match the throughput ratio
+candidate / baseline is printed, and the script exits with status 1 if any
+case is slower by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+_MEASURED = {"calls", "seconds", "calls_per_second", "steps_per_second", "peak_memory_bytes"}
+
+
+def _case_key(result: dict) -> tuple:
+    return tuple(sorted((k, v) for k, v in result.items() if k not in _MEASURED))
+
+
+def _throughput(result: dict) -> float:
+    return result.get("steps_per_second", result["calls_per_second"])
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list:
+    """Return (description, ratio, regressed) for every case in both reports."""
+
+    base_cases = {_case_key(r): r for r in baseline["results"]}
+    rows = []
+    for result in candidate["results"]:
+        key = _case_key(result)
+        if key not in base_cases:
+            continue
+        ratio = _throughput(result) / _throughput(base_cases[key])
+        description = " ".join(f"{k}={v}" for k, v in key)
+        rows.append((description, ratio, ratio < 1.0 - threshold))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two app.bench JSON reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown")
+    args = parser.parse_args()
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    with open(args.candidate) as handle:
+        candidate = json.load(handle)
+
+    print(f"baseline  {baseline['revision']}")
+    print(f"candidate {candidate['revision']}")
+    rows = compare(baseline, candidate, args.threshold)
+    for description, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{ratio:6.2f}x  {description}{flag}")
+    sys.exit(1 if any(regressed for _, _, regressed in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,28 @@
 """Tests for the variational ansatz."""
 
+import subprocess
+import sys
+
 import numpy as np
+import pytest
+
+from app import ansatz
+from app.ansatz import (
+    HardwareEfficientAnsatz,
+    ansatz_state,
+    ansatz_state_batch,
+    derivative_states,
+    derivative_states_batch,
+    prepare_initial_state,
+)
 
-from app.ansatz import ansatz_state, derivative_states, prepare_initial_state
+
+@pytest.fixture(params=ansatz.BACKENDS, autouse=True)
+def backend(request):
+    previous = ansatz.get_backend()
+    ansatz.set_backend(request.param)
+    yield request.param
+    ansatz.set_backend(previous)
 
 
 def test_state_is_normalized():
@@ -15,3 +35,60 @@ def test_derivative_shape():
     params = prepare_initial_state()
     derivs = derivative_states(params)
     assert derivs.shape == (len(params), 2)
+
+
+def test_derivatives_match_finite_differences():
+    params = np.array([0.4, -1.1, 2.3])
+    eps = 1e-6
+    numeric = np.array(
+        [(ansatz_state(params + eps * e) - ansatz_state(params - eps * e)) / (2 * eps) for e in np.eye(3)]
+    )
+    assert np.allclose(derivative_states(params), numeric, atol=1e-6)
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        ansatz.set_backend("qiskit")
+
+
+def test_batched_evaluation_matches_rows():
+    params_batch = np.random.default_rng(0).uniform(-np.pi, np.pi, size=(4, 3))
+    states = ansatz_state_batch(params_batch)
+    derivs = derivative_states_batch(params_batch)
+    assert states.shape == (4, 2)
+    assert derivs.shape == (4, 3, 2)
+    assert np.allclose(states, [ansatz_state(p) for p in params_batch])
+    assert np.allclose(derivs, [derivative_states(p) for p in params_batch])
+
+
+def test_hardware_efficient_ansatz_derivatives():
+    hea = HardwareEfficientAnsatz(n_qubits=3, n_layers=2, entangler="CZ")
+    params = np.random.default_rng(1).uniform(-np.pi, np.pi, size=hea.num_params)
+    state = hea.ansatz_state(params)
+    derivs = hea.derivative_states(params)
+    assert state.shape == (8,)
+    assert np.isclose(np.linalg.norm(state), 1.0)
+    assert derivs.shape == (hea.num_params, 8)
+    eps = 1e-6
+    numeric = np.array(
+        [
+            (hea.ansatz_state(params + eps * e) - hea.ansatz_state(params - eps * e)) / (2 * eps)
+            for e in np.eye(hea.num_params)
+        ]
+    )
+    assert np.allclose(derivs, numeric, atol=1e-6)
+
+
+def test_adjoint_jacobian_matches_derivative_states():
+    hea = HardwareEfficientAnsatz(n_qubits=3, n_layers=2, rotations=("RX", "RY", "RZ"))
+    rng = np.random.default_rng(2)
+    params = rng.uniform(-np.pi, np.pi, size=hea.num_params)
+    bra = rng.normal(size=8) + 1j * rng.normal(size=8)
+    expected = hea.derivative_states(params) @ np.conj(bra)
+    assert np.allclose(hea.adjoint_jacobian(params, bra), expected)
+
+
+def test_cli_import_does_not_load_pennylane_or_matplotlib():
+    code = "import sys, app.main; print('pennylane' in sys.modules, 'matplotlib' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ["False", "False"]
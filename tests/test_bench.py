@@ -0,0 +1,13 @@
+"""Smoke test for the benchmark entry point."""
+
+import json
+
+from app.bench import run_benchmarks
+
+
+def test_benchmark_report_is_json_serializable():
+    report = run_benchmarks(qubits=(2,), layers=(1,), dts=(0.25,), t_span=0.5, min_time=0.0)
+    cases = {result["case"] for result in report["results"]}
+    assert cases == {"derivative_states", "vqs_update", "run_exact_sim", "run_full_simulation"}
+    assert all(result["calls_per_second"] > 0 for result in report["results"])
+    json.dumps(report)
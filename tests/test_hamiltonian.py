@@ -1,8 +1,15 @@
 """Tests for time-dependent Hamiltonian construction."""
 
 import numpy as np
+import pennylane as qml
 
-from app.hamiltonian import H_of_t, hamiltonian_matrix
+from app.hamiltonian import (
+    DEFAULT_HAMILTONIAN,
+    H_of_t,
+    TimeDependentPauliHamiltonian,
+    hamiltonian_matrix,
+    ising_chain,
+)
 
 
 def test_hamiltonian_matches_matrix():
@@ -14,3 +21,43 @@ def test_hamiltonian_matches_matrix():
     assert np.allclose(pl_mat, H_mat)
     # Check Hermiticity
     assert np.allclose(pl_mat.conj().T, pl_mat)
+
+
+def test_pauli_hamiltonian_matches_pennylane():
+    model = ising_chain(3, coupling=0.7, field=lambda t: np.cos(t))
+    t = 0.4
+    pl_mat = qml.matrix(model.pennylane(t), wire_order=range(3))
+    assert np.allclose(model.matrix(t), pl_mat)
+    assert np.allclose(model.sparse_matrix(t).toarray(), pl_mat)
+
+
+def test_matrix_vectorizes_over_times():
+    times = np.linspace(0.0, 2.0, 5)
+    stacked = DEFAULT_HAMILTONIAN.matrix(times)
+    assert stacked.shape == (5, 2, 2)
+    assert np.allclose(stacked[3], hamiltonian_matrix(times[3]))
+
+
+def test_matrix_cache_reuses_repeated_times():
+    model = TimeDependentPauliHamiltonian([(np.cos, "Z"), (np.sin, "X")], cache_size=4)
+    first = model.matrix(0.7)
+    second = model.matrix(0.7)
+    assert second is first
+    assert model.cache_hits == 1 and model.cache_misses == 1
+    assert not first.flags.writeable
+    for t in range(6):
+        model.sparse_matrix(float(t))
+    assert len(model._cache) == 4
+
+
+def test_matrix_cache_is_bounded_in_bytes():
+    terms = [(np.cos, "ZZII"), (1.0, "XIII")]
+    model = TimeDependentPauliHamiltonian(terms, cache_bytes=2 * 16 * 16 * 16)
+    for t in range(4):
+        model.matrix(float(t))
+    assert len(model._cache) == 2
+    uncached = model.matrix(5.0, cache=False)
+    assert uncached.flags.writeable and len(model._cache) == 2
+    large = TimeDependentPauliHamiltonian(terms, cache_bytes=100)
+    large.matrix(0.0)
+    assert len(large._cache) == 0
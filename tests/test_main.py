@@ -0,0 +1,23 @@
+"""Tests for the command-line argument parsing."""
+
+import pytest
+
+from app.main import parse_args
+
+
+def test_run_options_default_and_override():
+    args = parse_args([])
+    assert (args.command, args.tmax, args.dt) == (None, 5.0, 0.05)
+    args = parse_args(["--tmax", "3", "--dt", "0.1"])
+    assert (args.tmax, args.dt) == (3.0, 0.1)
+
+
+def test_sweep_grid_options_are_separate():
+    args = parse_args(["sweep", "--tmax", "1", "2", "--dt", "0.1"])
+    assert args.sweep_tmax == [1.0, 2.0]
+    assert args.sweep_dt == [0.1]
+
+
+def test_root_run_options_are_rejected_with_sweep():
+    with pytest.raises(SystemExit):
+        parse_args(["--tmax", "3", "sweep"])
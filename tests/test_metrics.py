@@ -0,0 +1,48 @@
+"""Tests for the vectorized trajectory metrics."""
+
+import numpy as np
+
+from app.hamiltonian import DEFAULT_HAMILTONIAN, ising_chain
+from app.metrics import bloch_error, bloch_vectors, energy_error, fidelity, trace_distance, trajectory_metrics
+from app.plots import states_to_bloch
+
+
+def _random_states(shape, seed):
+    rng = np.random.default_rng(seed)
+    states = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+    return states / np.linalg.norm(states, axis=-1, keepdims=True)
+
+
+def test_fidelity_matches_loop_for_batched_trajectories():
+    psi, phi = _random_states((3, 20, 4), 0), _random_states((3, 20, 4), 1)
+    expected = np.array(
+        [[np.abs(np.vdot(a, b)) ** 2 for a, b in zip(rows_a, rows_b)] for rows_a, rows_b in zip(psi, phi)]
+    )
+    assert np.allclose(fidelity(psi, phi), expected)
+    assert np.allclose(trace_distance(psi, psi), 0.0, atol=1e-7)
+
+
+def test_bloch_vectors_of_product_state():
+    single = _random_states((5, 2), 2)
+    assert np.allclose(bloch_vectors(single)[:, 0], states_to_bloch(single))
+    zero = np.array([1.0, 0.0], dtype=complex)
+    product = np.einsum("ti,j->tij", single, zero).reshape(5, 4)
+    vectors = bloch_vectors(product)
+    assert np.allclose(vectors[:, 0], states_to_bloch(single))
+    assert np.allclose(vectors[:, 1], [0.0, 0.0, 1.0])
+    assert np.allclose(bloch_error(product, product), 0.0)
+
+
+def test_energy_error_with_stacked_hamiltonians():
+    times = np.linspace(0.0, 1.0, 6)
+    psi, phi = _random_states((6, 2), 3), _random_states((6, 2), 4)
+    H = DEFAULT_HAMILTONIAN.matrix(times)
+    expected = [np.real(np.vdot(a, h @ a) - np.vdot(b, h @ b)) for a, b, h in zip(psi, phi, H)]
+    assert np.allclose(energy_error(psi, phi, H), expected)
+
+
+def test_trajectory_metrics_keys():
+    psi, phi = _random_states((4, 8), 5), _random_states((4, 8), 6)
+    results = trajectory_metrics(psi, phi, ising_chain(3).matrix(0.0))
+    assert set(results) == {"fidelities", "trace_distances", "bloch_errors", "energy_errors"}
+    assert all(value.shape == (4,) for value in results.values())
@@ -0,0 +1,32 @@
+"""Tests for plotting helpers."""
+
+import os
+
+import numpy as np
+
+from app.plots import decimate, plot_bloch_trajectory, states_to_bloch
+
+
+def test_states_to_bloch_known_states():
+    states = np.array([[1, 0], [0, 1], [1, 1], [1, 1j]]) / np.array([[1], [1], [np.sqrt(2)], [np.sqrt(2)]])
+    expected = [[0, 0, 1], [0, 0, -1], [1, 0, 0], [0, 1, 0]]
+    assert np.allclose(states_to_bloch(states), expected)
+
+
+def test_decimation_respects_budget_and_endpoints():
+    t = np.linspace(0, 10, 50_000)
+    curve = np.column_stack([t, np.where(t < 5, 0.0, np.sin(20 * t))])
+    for mode in ("uniform", "curvature"):
+        keep = decimate(curve, 500, mode)
+        assert len(keep) <= 502
+        assert keep[0] == 0 and keep[-1] == len(t) - 1
+    # The curvature mode spends most points on the oscillating half
+    assert np.mean(decimate(curve, 500, "curvature") > len(t) // 2) > 0.6
+
+
+def test_bloch_plot_size_is_bounded(tmp_path):
+    phases = np.linspace(0, 40 * np.pi, 100_000)
+    states = np.column_stack([np.full_like(phases, np.sqrt(0.5)), np.sqrt(0.5) * np.exp(1j * phases)])
+    path = str(tmp_path / "bloch.svg")
+    plot_bloch_trajectory(states, path, max_points=500)
+    assert os.path.getsize(path) < 500_000
@@ -0,0 +1,26 @@
+"""Tests for the opt-in stage instrumentation."""
+
+from app import profiling
+from app.trainer import run_full_simulation
+
+
+def test_disabled_profiling_records_nothing():
+    profiling.reset()
+    run_full_simulation(t_span=0.2, dt=0.1)
+    assert profiling.report() == {}
+
+
+def test_enabled_profiling_records_vqs_stages():
+    profiling.reset()
+    profiling.enable()
+    try:
+        run_full_simulation(t_span=0.5, dt=0.25)
+    finally:
+        profiling.disable()
+    stats = profiling.report()
+    for name in ("ansatz.jacobian", "hamiltonian.matrix", "vqs.solve", "history.write", "exact.expm"):
+        assert name in stats
+    assert stats["ansatz.jacobian"]["calls"] == 2
+    assert sum(stats["vqs.solve"]["histogram"]) == 2
+    assert "ansatz.jacobian" in profiling.format_table()
+    profiling.reset()
@@ -0,0 +1,54 @@
+"""Tests for finite-shot estimation of the McLachlan system."""
+
+import numpy as np
+
+from app.ansatz import HardwareEfficientAnsatz
+from app.hamiltonian import ising_chain
+from app.shots import ShotEstimator, allocate_shots, shot_solve_step, theta_dot_std
+from app.vqs_core import A_from_derivatives, C_from_context, LinearSolver, solve_step, step_context
+
+
+def test_allocate_shots_is_proportional_and_exact():
+    shots = allocate_shots(np.array([1.0, 2.0, 3.5, 0.0]), 10)
+    assert shots.sum() == 10
+    assert shots[3] == 0
+    assert np.all(np.diff(shots[:3]) >= 0)
+
+
+def test_estimates_agree_with_exact_system_within_error_bars():
+    hea = HardwareEfficientAnsatz(n_qubits=2, n_layers=1)
+    hamiltonian = ising_chain(2)
+    ctx = step_context(np.linspace(0.1, 0.8, hea.num_params), 0.3, hea, hamiltonian)
+    estimate = ShotEstimator(shots_per_step=200000, seed=0).estimate(ctx, hamiltonian)
+
+    C_error = np.abs(estimate.C - C_from_context(ctx))
+    A_error = np.abs(estimate.A - A_from_derivatives(ctx.derivs, shift=0.0))
+    assert np.all(C_error <= 5.0 * np.sqrt(estimate.C_variance) + 1e-12)
+    assert np.all(A_error <= 5.0 * np.sqrt(estimate.A_variance) + 1e-12)
+    assert estimate.shots.sum() == 200000
+
+
+def test_theta_dot_error_shrinks_with_shots():
+    ctx = step_context(np.array([0.3, 0.5, 0.7]), 0.4)
+    exact, _ = solve_step(ctx)
+    small = shot_solve_step(ctx, ShotEstimator(shots_per_step=1000, seed=1))
+    large = shot_solve_step(ctx, ShotEstimator(shots_per_step=100000, seed=1))
+    assert np.all(large[2] < small[2])
+    assert np.all(np.abs(large[0] - exact) <= 5.0 * large[2])
+
+
+def test_theta_dot_std_matches_finite_differences():
+    rng = np.random.default_rng(3)
+    M = rng.normal(size=(4, 4))
+    A, C = M @ M.T + np.eye(4), rng.normal(size=4)
+    solver = LinearSolver("tikhonov", regularization=1e-3)
+    theta = solver.solve(A, C)[0]
+    A_variance, C_variance = np.zeros((4, 4)), np.zeros(4)
+    A_variance[1, 2], C_variance[3] = 1e-4, 4e-4
+    dA = np.zeros((4, 4))
+    dA[1, 2] = dA[2, 1] = 1e-2
+    dC = np.zeros(4)
+    dC[3] = 2e-2
+    # The two independent perturbations add in quadrature
+    expected = np.hypot(solver.solve(A + dA, C)[0] - theta, solver.solve(A, C + dC)[0] - theta)
+    assert np.allclose(theta_dot_std(A, theta, A_variance, C_variance, solver), expected, rtol=0.05)
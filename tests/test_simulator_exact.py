@@ -2,8 +2,8 @@
 
 import numpy as np
 
-from app.hamiltonian import initial_state
-from app.simulator_exact import exact_step
+from app.hamiltonian import hamiltonian_matrix, hamiltonian_sparse, heisenberg_chain, initial_state
+from app.simulator_exact import exact_step, run_exact_sim
 
 
 def test_exact_step_changes_state():
@@ -12,3 +12,73 @@ def test_exact_step_changes_state():
     # State should remain normalized but differ from start
     assert np.isclose(np.linalg.norm(psi1), 1.0)
     assert not np.allclose(psi1, psi0)
+
+
+def test_su2_engine_matches_expm():
+    psi0 = initial_state()
+    reference = run_exact_sim(psi0, t_span=3.0, dt=0.05, engine="expm")
+    vectorized = run_exact_sim(psi0, t_span=3.0, dt=0.05, engine="su2")
+    assert vectorized.shape == reference.shape
+    assert np.allclose(vectorized, reference)
+
+
+def test_krylov_engine_matches_expm():
+    psi0 = initial_state()
+    reference = run_exact_sim(psi0, t_span=1.0, dt=0.1, engine="expm")
+    krylov = run_exact_sim(psi0, t_span=1.0, dt=0.1, engine="krylov")
+    assert krylov.shape == reference.shape
+    assert np.allclose(krylov, reference)
+
+
+def test_krylov_engine_handles_multi_qubit_models():
+    model = heisenberg_chain(4, field=lambda t: np.sin(t))
+    psi0 = np.zeros(model.dim, dtype=complex)
+    psi0[0b0101] = 1.0
+    reference = run_exact_sim(psi0, t_span=0.5, dt=0.1, engine="expm", hamiltonian=model.sparse_matrix)
+    krylov = run_exact_sim(psi0, t_span=0.5, dt=0.1, engine="krylov", hamiltonian=model)
+    assert krylov.shape == (6, 16)
+    assert np.allclose(krylov, reference)
+
+
+def test_magnus4_is_fourth_order_and_beats_left_endpoint():
+    psi0 = initial_state()
+    reference = run_exact_sim(psi0, t_span=4.0, dt=1e-3, engine="magnus4")[-1]
+    coarse = np.linalg.norm(run_exact_sim(psi0, t_span=4.0, dt=0.2, engine="magnus4")[-1] - reference)
+    fine = np.linalg.norm(run_exact_sim(psi0, t_span=4.0, dt=0.1, engine="magnus4")[-1] - reference)
+    assert 12.0 < coarse / fine < 20.0
+    left_endpoint = run_exact_sim(psi0, t_span=4.0, dt=0.01, engine="su2")[-1]
+    assert coarse < np.linalg.norm(left_endpoint - reference)
+
+
+def test_magnus4_closed_form_matches_generic_path():
+    psi0 = initial_state()
+    closed_form = run_exact_sim(psi0, t_span=2.0, dt=0.1, engine="magnus4")
+    generic = run_exact_sim(psi0, t_span=2.0, dt=0.1, engine="magnus4", hamiltonian=hamiltonian_matrix)
+    sparse_path = run_exact_sim(psi0, t_span=2.0, dt=0.1, engine="magnus4", hamiltonian=hamiltonian_sparse)
+    assert np.allclose(closed_form, generic)
+    assert np.allclose(closed_form, sparse_path)
+
+
+def test_batch_of_states_matches_individual_runs():
+    rng = np.random.default_rng(0)
+    batch = rng.normal(size=(6, 2)) + 1j * rng.normal(size=(6, 2))
+    batch /= np.linalg.norm(batch, axis=1, keepdims=True)
+    for engine in ("expm", "su2", "krylov", "magnus4"):
+        ensemble = run_exact_sim(batch, t_span=1.0, dt=0.1, engine=engine)
+        runs = [run_exact_sim(psi, t_span=1.0, dt=0.1, engine=engine) for psi in batch]
+        individual = np.stack(runs, axis=1)
+        assert ensemble.shape == (11, 6, 2)
+        assert np.allclose(ensemble, individual)
+
+
+def test_density_matrix_evolves_as_mixture():
+    model = heisenberg_chain(2, field=0.4)
+    up, down = np.eye(4, dtype=complex)[1], np.eye(4, dtype=complex)[2]
+    rho0 = 0.75 * np.outer(up, up.conj()) + 0.25 * np.outer(down, down.conj())
+    rho = run_exact_sim(rho0, t_span=1.0, dt=0.1, engine="krylov", hamiltonian=model, density_matrix=True)
+    pure = [run_exact_sim(psi, t_span=1.0, dt=0.1, engine="krylov", hamiltonian=model) for psi in (up, down)]
+    expected = 0.75 * np.einsum("ti,tj->tij", pure[0], pure[0].conj())
+    expected += 0.25 * np.einsum("ti,tj->tij", pure[1], pure[1].conj())
+    assert rho.shape == (11, 4, 4)
+    assert np.allclose(rho, expected)
+    assert np.allclose(np.trace(rho, axis1=1, axis2=2), 1.0)
@@ -0,0 +1,62 @@
+"""Tests for the streaming trajectory sinks."""
+
+import numpy as np
+
+from app.sinks import ChunkedArray, make_sink
+from app.trainer import run_full_simulation
+
+
+def test_file_sinks_match_in_memory_results(tmp_path):
+    reference = run_full_simulation(t_span=0.5, dt=0.1, trotter_order=1)
+    names = ("variational_states", "exact_states", "param_history", "times")
+    names += ("fidelities", "trotter_fidelities")
+    for kind in ("npy", "chunked"):
+        sink = make_sink(kind, str(tmp_path / kind), **({"chunk_rows": 2} if kind == "chunked" else {}))
+        run_full_simulation(t_span=0.5, dt=0.1, sink=sink, trotter_order=1)
+        for name in names:
+            assert np.allclose(np.asarray(sink.read(name)), reference[name])
+
+
+def test_npy_sink_reads_back_memory_mapped(tmp_path):
+    sink = make_sink("npy", str(tmp_path))
+    array = sink.allocate("states", (3, 2), complex)
+    array[1] = [1.0, 1.0j]
+    stored = sink.read("states")
+    assert isinstance(stored, np.memmap)
+    assert np.allclose(stored[1], [1.0, 1.0j])
+
+
+def test_chunked_array_reopens_released_chunks(tmp_path):
+    array = ChunkedArray(str(tmp_path / "values"), (10,), float, chunk_rows=3)
+    for k in range(10):
+        array[k] = k
+    array[0] = -1.0
+    reopened = ChunkedArray.open(str(tmp_path / "values"))
+    assert reopened.num_chunks == 4
+    assert np.allclose(np.asarray(reopened), [-1.0] + list(range(1, 10)))
+
+
+def test_chunked_array_indexing_matches_numpy(tmp_path):
+    reference = np.arange(20.0).reshape(10, 2)
+    array = ChunkedArray(str(tmp_path / "rows"), reference.shape, float, chunk_rows=3)
+    array[:] = reference
+    keys = (4, -1, (7, 1), slice(2, 8), slice(None, None, -3), (slice(1, 9, 2), 0), [9, 0, 4], slice(5, 5))
+    for key in keys:
+        assert np.array_equal(array[key], reference[key])
+    assert np.array_equal(np.array(list(array)), reference)
+
+
+def test_chunked_array_assignment_matches_numpy(tmp_path):
+    reference = np.zeros((10, 2))
+    array = ChunkedArray(str(tmp_path / "rows"), reference.shape, float, chunk_rows=3)
+    updates = [
+        (slice(None), 1.0),
+        ((1, 0), 5.0),
+        ([0, 1], 2.0),
+        (slice(8, 1, -2), [[3.0, 4.0]]),
+        ((slice(2, 7), 1), 7.0),
+    ]
+    for key, value in updates:
+        array[key] = value
+        reference[key] = value
+    assert np.array_equal(np.asarray(array), reference)
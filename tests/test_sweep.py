@@ -0,0 +1,20 @@
+"""Tests for the process-pool parameter sweep."""
+
+import numpy as np
+
+from app.sweep import build_grid, run_config, run_sweep
+
+
+def test_build_grid_is_cartesian_product():
+    grid = build_grid([0.2, 0.4], [0.1], hamiltonian_coefficients=[(1.0, 1.0), (0.5, 2.0)])
+    assert len(grid) == 4
+    assert {config["tmax"] for config in grid} == {0.2, 0.4}
+
+
+def test_run_sweep_streams_all_summaries():
+    configs = build_grid([0.2], [0.1], initial_params=[[0.05, 0.05, 0.05], [0.3, 0.1, 0.2]])
+    summaries = sorted(run_sweep(configs, max_workers=2), key=lambda summary: summary["index"])
+    assert [summary["index"] for summary in summaries] == [0, 1]
+    serial = run_config(configs[1])
+    assert np.isclose(summaries[1]["mean_fidelity"], serial["mean_fidelity"])
+    assert all(0.0 <= summary["min_fidelity"] <= 1.0 + 1e-9 for summary in summaries)
@@ -1,8 +1,13 @@
 """End-to-end check for the training loop."""
 
 import numpy as np
+import pytest
 
-from app.trainer import run_full_simulation
+from app.ansatz import HardwareEfficientAnsatz, prepare_initial_state
+from app.checkpoint import load_checkpoint
+from app.hamiltonian import DEFAULT_HAMILTONIAN, hamiltonian_matrix, ising_chain
+from app.shots import ShotEstimator
+from app.trainer import resume_vqs, run_full_simulation, run_vqs
 
 
 def test_full_simulation_runs():
@@ -11,3 +16,150 @@ def test_full_simulation_runs():
     assert results["fidelities"].shape[0] == int(0.2 / 0.1) + 1
     assert np.all(results["fidelities"] <= 1.0)
     assert np.all(results["fidelities"] >= 0.0)
+
+
+def test_full_simulation_with_multi_qubit_model():
+    hea = HardwareEfficientAnsatz(n_qubits=2, n_layers=2)
+    results = run_full_simulation(t_span=0.2, dt=0.1, ansatz=hea, hamiltonian=ising_chain(2))
+    assert results["variational_states"].shape == (3, 4)
+    assert results["param_history"].shape == (3, hea.num_params)
+    assert np.isclose(results["fidelities"][0], 1.0)
+    assert np.all(results["fidelities"] <= 1.0 + 1e-9)
+
+
+def test_adaptive_integrator_records_step_times():
+    results = run_full_simulation(t_span=0.5, dt=0.25, integrator="rk45")
+    step_times = results["step_times"]
+    assert np.all(np.diff(step_times) > 0)
+    assert np.isclose(step_times[-1], 0.5)
+    assert np.min(results["fidelities"]) > 0.99
+
+
+def test_condition_numbers_reported_per_step():
+    results = run_full_simulation(t_span=0.2, dt=0.1, solver="pinv")
+    assert results["condition_numbers"].shape == (2,)
+    assert np.all(results["condition_numbers"] >= 1.0)
+
+
+def test_resume_from_checkpoint_is_bit_for_bit(tmp_path):
+    params0 = prepare_initial_state()
+    path = str(tmp_path / "run.npz")
+    full_states, full_params, full_info = run_vqs(
+        params0, 1.0, 0.1, hamiltonian=hamiltonian_matrix, integrator="rk45", return_diagnostics=True
+    )
+
+    def failing_hamiltonian(t):
+        if t > 0.55:
+            raise RuntimeError("node preempted")
+        return hamiltonian_matrix(t)
+
+    with pytest.raises(RuntimeError):
+        run_vqs(
+            params0,
+            1.0,
+            0.1,
+            hamiltonian=failing_hamiltonian,
+            integrator="rk45",
+            checkpoint_path=path,
+            checkpoint_every=2,
+        )
+    states, params, info = resume_vqs(path, hamiltonian=hamiltonian_matrix, return_diagnostics=True)
+    assert np.array_equal(states, full_states)
+    assert np.array_equal(params, full_params)
+    assert np.array_equal(info["step_times"], full_info["step_times"])
+
+
+def test_checkpoint_keeps_histories_out_of_the_archive(tmp_path):
+    path = str(tmp_path / "run.npz")
+    states, params = run_vqs(prepare_initial_state(), 1.0, 0.1, checkpoint_path=path, checkpoint_every=3)
+    with np.load(path) as data:
+        assert "param_history" not in data and "state_history" not in data
+    progress, _ = load_checkpoint(path)
+    assert np.array_equal(progress["param_history"], params)
+    # The last state is computed after the final checkpoint
+    assert np.array_equal(progress["state_history"][:-1], states[:-1])
+    resumed_states, resumed_params = resume_vqs(path)
+    assert np.array_equal(resumed_states, states) and np.array_equal(resumed_params, params)
+
+    kwargs = dict(mode="imaginary", energy_tol=1e-6, checkpoint_path=path, return_diagnostics=True)
+    states, params, info = run_vqs(prepare_initial_state() + 0.5, 6.0, 0.05, **kwargs)
+    assert info["converged"]
+    resumed_states, resumed_params, _ = resume_vqs(path, return_diagnostics=True)
+    assert np.array_equal(resumed_states, states) and np.array_equal(resumed_params, params)
+
+
+def test_shot_based_run_reports_errors_and_resumes_exactly(tmp_path):
+    params0 = prepare_initial_state()
+    path = str(tmp_path / "shots.npz")
+    full_states, full_params, full_info = run_vqs(
+        params0,
+        0.5,
+        0.1,
+        hamiltonian=DEFAULT_HAMILTONIAN,
+        shots=ShotEstimator(2000, seed=3),
+        return_diagnostics=True,
+    )
+    assert full_info["theta_dot_std"].shape == (5, 3)
+    assert np.all(full_info["theta_dot_std"] > 0.0)
+
+    class FailingModel:
+        term_matrices = DEFAULT_HAMILTONIAN.term_matrices
+
+        coefficients = DEFAULT_HAMILTONIAN.coefficients
+
+        def __call__(self, t):
+            if t > 0.25:
+                raise RuntimeError("node preempted")
+            return DEFAULT_HAMILTONIAN(t)
+
+    with pytest.raises(RuntimeError):
+        run_vqs(
+            params0,
+            0.5,
+            0.1,
+            hamiltonian=FailingModel(),
+            shots=ShotEstimator(2000, seed=3),
+            checkpoint_path=path,
+            checkpoint_every=1,
+        )
+    # The generator state comes from the checkpoint, not from the new seed.
+    states, params, info = resume_vqs(
+        path, hamiltonian=DEFAULT_HAMILTONIAN, shots=ShotEstimator(2000, seed=99), return_diagnostics=True
+    )
+    assert np.array_equal(params, full_params)
+    assert np.array_equal(info["theta_dot_std"], full_info["theta_dot_std"])
+
+
+def test_imaginary_time_reaches_ground_state_and_stops():
+    hea = HardwareEfficientAnsatz(n_qubits=3, n_layers=2)
+    model = ising_chain(3)
+    _, params, info = run_vqs(
+        hea.prepare_initial_state() + 0.1,
+        10.0,
+        0.05,
+        ansatz=hea,
+        hamiltonian=model,
+        mode="imaginary",
+        energy_tol=1e-9,
+        return_diagnostics=True,
+    )
+    assert info["converged"]
+    assert params.shape[0] == info["energies"].shape[0] < 201
+    assert np.all(np.diff(info["energies"]) <= 1e-9)
+    assert np.isclose(info["energies"][-1], np.linalg.eigvalsh(model.matrix(0.0))[0], atol=1e-6)
+
+
+def test_imaginary_time_freezes_time_dependent_hamiltonian():
+    # The default H(t) = cos t Z + sin t X keeps rotating in physical time
+    for hamiltonian_time in (0.0, 0.7):
+        _, _, info = run_vqs(
+            prepare_initial_state() + 0.5,
+            6.0,
+            0.05,
+            mode="imaginary",
+            energy_tol=1e-8,
+            hamiltonian_time=hamiltonian_time,
+            return_diagnostics=True,
+        )
+        assert info["converged"]
+        assert np.isclose(info["energies"][-1], -1.0, atol=1e-4)
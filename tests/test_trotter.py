@@ -0,0 +1,47 @@
+"""Tests for the Trotterized circuit baseline."""
+
+import numpy as np
+
+from app.hamiltonian import TimeDependentPauliHamiltonian, heisenberg_chain
+from app.simulator_exact import run_exact_sim
+from app.trainer import run_full_simulation
+from app.trotter import TrotterCircuit, run_trotter_sim
+
+
+def _infidelity(psi, phi):
+    return 1.0 - np.abs(np.vdot(psi, phi)) ** 2
+
+
+def test_commuting_terms_are_exact():
+    model = TimeDependentPauliHamiltonian([(0.7, "ZZ"), (-0.3, "ZI"), (0.2, "IZ")])
+    psi0 = np.full(4, 0.5, dtype=complex)
+    exact = run_exact_sim(psi0, 1.0, 0.1, hamiltonian=model)
+    trotter = run_trotter_sim(psi0, 1.0, 0.1, model)
+    assert np.allclose(trotter, exact)
+
+
+def test_orders_converge_at_expected_rates():
+    model = heisenberg_chain(3, field=0.3)
+    psi0 = np.zeros(8, dtype=complex)
+    psi0[1] = 1.0
+    reference = run_exact_sim(psi0, 1.0, 0.5, hamiltonian=model)[-1]
+    for order, expected_ratio in ((1, 4.0), (2, 16.0)):
+        coarse = _infidelity(run_trotter_sim(psi0, 1.0, 0.1, model, order)[-1], reference)
+        fine = _infidelity(run_trotter_sim(psi0, 1.0, 0.05, model, order)[-1], reference)
+        # infidelity is the squared state error, so it falls as dt^(2 * order)
+        assert 0.7 * expected_ratio < coarse / fine < 1.3 * expected_ratio
+
+
+def test_gate_counts():
+    model = heisenberg_chain(3, field=0.3)
+    assert TrotterCircuit(model, 1).rotations_per_step == 9
+    assert TrotterCircuit(model, 1).cnots_per_step == 12
+    assert TrotterCircuit(model, 2).rotations_per_step == 17
+    assert TrotterCircuit(model, 2).cnots_per_step == 24
+
+
+def test_full_simulation_reports_trotter_baseline():
+    results = run_full_simulation(t_span=0.5, dt=0.05, trotter_order=2)
+    assert results["trotter_states"].shape == results["exact_states"].shape
+    assert np.min(results["trotter_fidelities"]) > 0.999
+    assert set(results["wall_times"]) == {"vqs", "exact", "trotter"}
@@ -2,8 +2,24 @@
 
 import numpy as np
 
-from app.ansatz import prepare_initial_state
-from app.vqs_core import compute_A_matrix, compute_C_vector, vqs_update
+from app.ansatz import (
+    HardwareEfficientAnsatz,
+    ansatz_state_batch,
+    derivative_states_batch,
+    prepare_initial_state,
+)
+from app.hamiltonian import hamiltonian_matrix, ising_chain
+from app.vqs_core import (
+    A_from_context,
+    A_from_derivatives,
+    C_from_context,
+    C_from_derivatives,
+    LinearSolver,
+    compute_A_matrix,
+    compute_C_vector,
+    step_context,
+    vqs_update,
+)
 
 
 def test_shapes_and_finiteness():
@@ -21,3 +37,73 @@ def test_vqs_update_moves_parameters():
     new_params = vqs_update(params, t=0.0, dt=0.1)
     assert new_params.shape == params.shape
     assert not np.allclose(new_params, params)
+
+
+def test_step_context_matches_separate_builders():
+    params = prepare_initial_state()
+    ctx = step_context(params, t=0.3)
+    assert np.allclose(A_from_context(ctx), compute_A_matrix(params))
+    assert np.allclose(C_from_context(ctx), compute_C_vector(params, t=0.3))
+
+
+def test_adjoint_C_vector_matches_context():
+    hea = HardwareEfficientAnsatz(n_qubits=2, n_layers=2)
+    model = ising_chain(2, field=0.5)
+    params = np.linspace(0.1, 0.8, hea.num_params)
+    ctx = step_context(params, 0.2, hea, model)
+    assert np.allclose(compute_C_vector(params, 0.2, hea, model), C_from_context(ctx))
+
+
+def test_batched_builders_match_single_sets():
+    params_batch = np.random.default_rng(3).uniform(-1.0, 1.0, size=(5, 3))
+    derivs = derivative_states_batch(params_batch)
+    h_psi = ansatz_state_batch(params_batch) @ hamiltonian_matrix(0.4).T
+    A_batch = A_from_derivatives(derivs)
+    C_batch = C_from_derivatives(derivs, h_psi)
+    assert A_batch.shape == (5, 3, 3)
+    assert C_batch.shape == (5, 3)
+    for params, A, C in zip(params_batch, A_batch, C_batch):
+        assert np.allclose(A, compute_A_matrix(params))
+        assert np.allclose(C, compute_C_vector(params, t=0.4))
+
+
+def test_integrators_converge_to_each_other():
+    params = prepare_initial_state()
+    rk4 = vqs_update(params, t=0.0, dt=0.1, integrator="rk4")
+    rk45 = vqs_update(params, t=0.0, dt=0.1, integrator="rk45")
+    euler = vqs_update(params, t=0.0, dt=0.1, integrator="euler")
+    assert np.allclose(rk4, rk45, atol=1e-5)
+    assert np.linalg.norm(euler - rk45) > np.linalg.norm(rk4 - rk45)
+
+
+def test_solver_strategies_handle_singular_A():
+    A = np.array([[1.0, 0.0], [0.0, 0.0]])
+    C = np.array([0.5, 0.0])
+    for method in ("tikhonov", "pinv", "adaptive"):
+        solution, condition = LinearSolver(method=method).solve(A, C)
+        assert np.isinf(condition)
+        assert np.allclose(solution, [0.5, 0.0], atol=1e-6)
+    well_posed = np.array([[2.0, 0.0], [0.0, 1.0]])
+    solution, condition = LinearSolver(method="adaptive").solve(well_posed, C)
+    assert np.isclose(condition, 2.0)
+    assert np.allclose(solution, np.linalg.solve(well_posed, C))
+
+
+def test_imaginary_time_C_is_half_the_energy_gradient():
+    hea = HardwareEfficientAnsatz(n_qubits=2, n_layers=2)
+    model = ising_chain(2, field=0.5)
+    params = np.linspace(0.1, 0.8, hea.num_params)
+    H = model.matrix(0.0)
+
+    def energy(p):
+        state = hea.ansatz_state(p)
+        return np.real(np.vdot(state, H @ state))
+
+    eps = 1e-6
+    gradient = np.array(
+        [(energy(params + eps * e) - energy(params - eps * e)) / (2 * eps) for e in np.eye(hea.num_params)]
+    )
+    ctx = step_context(params, 0.0, hea, model)
+    adjoint_C = compute_C_vector(params, 0.0, hea, model, mode="imaginary")
+    assert np.allclose(C_from_context(ctx, mode="imaginary"), -0.5 * gradient, atol=1e-6)
+    assert np.allclose(adjoint_C, -0.5 * gradient, atol=1e-6)